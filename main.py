@@ -11,45 +11,76 @@
 import os
 import sys
 import subprocess
+import importlib.util
 import json
+import re
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import time
 import random
+import secrets
+import functools
+from collections import Counter, OrderedDict
+from typing import NamedTuple
 from datetime import datetime, timedelta, timezone
 import threading
+import atexit
+import queue
 import logging
+import logging.handlers
+from concurrent.futures import ThreadPoolExecutor
 
-# Configure logging for cloud environment
+# Configure logging for cloud environment - callers only enqueue records,
+# a listener thread does the stdout writes
+_log_queue = queue.SimpleQueue()
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
     handlers=[
-        logging.StreamHandler(sys.stdout)
+        logging.handlers.QueueHandler(_log_queue)
     ]
 )
+_log_listener = logging.handlers.QueueListener(_log_queue, logging.StreamHandler(sys.stdout))
+_log_listener.start()
+atexit.register(_log_listener.stop)
 logger = logging.getLogger(__name__)
 
 # ============================================================================
 # CLOUD-SAFE DEPENDENCY INSTALLER (Same as original)
 # ============================================================================
 
+# pip package name -> importable module name
+DEPENDENCIES = {
+    'requests': 'requests',
+    'pyTelegramBotAPI': 'telebot',
+    'gspread': 'gspread',
+    'google-auth': 'google.oauth2',
+    'fastapi': 'fastapi',
+    'uvicorn': 'uvicorn',
+}
+
+def module_available(module_name):
+    """Check a module is importable without importing it"""
+    try:
+        return importlib.util.find_spec(module_name) is not None
+    except ModuleNotFoundError:
+        return False
+
 def install_dependencies():
     """Install required dependencies for cloud deployment"""
-    deps = ['requests', 'pyTelegramBotAPI', 'gspread', 'google-auth']
-    
-    logger.info("📦 Installing dependencies for cloud deployment...")
-    for dep in deps:
-        try:
-            __import__(dep.replace('-', '_').lower())
-            logger.info(f"✅ {dep:15} - Already available")
-        except ImportError:
-            logger.info(f"📦 {dep:15} - Installing...")
+    logger.info("📦 Checking dependencies for cloud deployment...")
+    for dep, module_name in DEPENDENCIES.items():
+        if module_available(module_name):
+            logger.info("✅ %-15s - Already available", dep)
+        else:
+            logger.info("📦 %-15s - Installing...", dep)
             try:
                 subprocess.check_call([sys.executable, "-m", "pip", "install", dep], 
                                     stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-                logger.info(f"✅ {dep:15} - Installed successfully")
+                logger.info("✅ %-15s - Installed successfully", dep)
             except Exception as e:
-                logger.error(f"❌ {dep:15} - Installation failed: {e}")
+                logger.error("❌ %-15s - Installation failed: %s", dep, e)
                 return False
     return True
 
@@ -61,11 +92,9 @@ if not install_dependencies():
 try:
     import telebot
     from telebot import types
-    import gspread
-    from google.oauth2.service_account import Credentials
     logger.info("✅ All imports successful for cloud deployment!")
 except ImportError as e:
-    logger.error(f"❌ Import failed: {e}")
+    logger.error("❌ Import failed: %s", e)
     sys.exit(1)
 
 # ============================================================================
@@ -76,7 +105,7 @@ def get_env_var(var_name, default=None, required=True):
     """Safely get environment variable"""
     value = os.getenv(var_name, default)
     if required and not value:
-        logger.error(f"❌ Required environment variable {var_name} not found!")
+        logger.error("❌ Required environment variable %s not found!", var_name)
         sys.exit(1)
     return value
 
@@ -85,6 +114,18 @@ TELEGRAM_BOT_TOKEN = get_env_var("TELEGRAM_BOT_TOKEN")
 GOOGLE_SHEET_ID = get_env_var("GOOGLE_SHEET_ID")
 GOLDAPI_KEY = get_env_var("GOLDAPI_KEY")
 
+# Webhook mode - public base URL, e.g. https://<app>.up.railway.app.
+# Defaults to the Railway public domain when one is assigned; long polling only without either.
+RAILWAY_PUBLIC_DOMAIN = get_env_var("RAILWAY_PUBLIC_DOMAIN", required=False)
+WEBHOOK_URL = get_env_var("WEBHOOK_URL", required=False) or (
+    f"https://{RAILWAY_PUBLIC_DOMAIN}" if RAILWAY_PUBLIC_DOMAIN else None
+)
+PORT = int(get_env_var("PORT", "8080", required=False))
+# Checked against Telegram's X-Telegram-Bot-Api-Secret-Token header; random per start if unset
+WEBHOOK_SECRET = get_env_var("WEBHOOK_SECRET", required=False) or secrets.token_urlsafe(32)
+# Update worker threads - handlers block on Telegram/Sheets I/O, so one slow chat must not stall the rest
+BOT_WORKER_THREADS = int(get_env_var("BOT_WORKER_THREADS", "8", required=False))
+
 # Google credentials from environment
 GOOGLE_CREDENTIALS = {
     "type": "service_account",
@@ -112,6 +153,28 @@ def get_uae_time():
     """Get current time in UAE timezone"""
     return datetime.now(UAE_TZ)
 
+_uae_stamp = (None, "")  # (epoch second, formatted) - swapped as one tuple so readers never see a torn pair
+
+def uae_timestamp():
+    """Current UAE 'YYYY-MM-DD HH:MM:SS', formatted at most once per wall-clock second"""
+    global _uae_stamp
+    now = int(time.time())
+    second, text = _uae_stamp
+    if second != now:
+        text = datetime.fromtimestamp(now, UAE_TZ).strftime('%Y-%m-%d %H:%M:%S')
+        _uae_stamp = (now, text)
+    return text
+
+def format_update_epoch(epoch):
+    """UAE wall-clock HH:MM:SS for an update epoch (None -> never updated)"""
+    if epoch is None:
+        return "00:00:00"
+    return datetime.fromtimestamp(epoch, UAE_TZ).strftime('%H:%M:%S')
+
+def format_last_update(market):
+    """UAE wall-clock time of a market snapshot's last update"""
+    return format_update_epoch(market["last_update_epoch"])
+
 TROY_OUNCE_TO_GRAMS = 31.1035  # Official troy ounce conversion
 USD_TO_AED_RATE = 3.674         # Current USD to AED exchange rate
 
@@ -127,6 +190,10 @@ PURITY_MULTIPLIERS = {
     "custom": 0.118122  # Default to 999 pure gold
 }
 
+# Precomputed (purity_factor, multiplier) per purity code - one lookup per calculation
+PURITY_LOOKUP = {value: (float(value), multiplier) for value, multiplier in PURITY_MULTIPLIERS.items() if value != "custom"}
+PURITY_LOOKUP["custom"] = (999, PURITY_MULTIPLIERS["custom"])
+
 # UPDATED DEALERS WITH APPROVAL WORKFLOW
 DEALERS = {
     "2268": {"name": "Ahmadreza", "level": "admin", "active": True, "permissions": ["buy", "sell", "admin", "final_approve", "reject", "delete_row"], "telegram_id": None},
@@ -157,14 +224,14 @@ GOLD_TYPES = [
 
 # VERIFIED PURITY OPTIONS
 GOLD_PURITIES = [
-    {"name": "9999 (99.99% Pure Gold)", "value": 9999, "multiplier": 0.118241},
-    {"name": "999 (99.9% Pure Gold)", "value": 999, "multiplier": 0.118122},
-    {"name": "995 (99.5% Pure Gold)", "value": 995, "multiplier": 0.117649},
-    {"name": "916 (22K Jewelry)", "value": 916, "multiplier": 0.108308},
-    {"name": "875 (21K Jewelry)", "value": 875, "multiplier": 0.103460},
-    {"name": "750 (18K Jewelry)", "value": 750, "multiplier": 0.088680},
-    {"name": "990 (99.0% Pure Gold)", "value": 990, "multiplier": 0.117058},
-    {"name": "Custom", "value": "custom", "multiplier": 0.118122}
+    {"name": "9999 (99.99% Pure Gold)", "value": 9999, "multiplier": PURITY_MULTIPLIERS[9999]},
+    {"name": "999 (99.9% Pure Gold)", "value": 999, "multiplier": PURITY_MULTIPLIERS[999]},
+    {"name": "995 (99.5% Pure Gold)", "value": 995, "multiplier": PURITY_MULTIPLIERS[995]},
+    {"name": "916 (22K Jewelry)", "value": 916, "multiplier": PURITY_MULTIPLIERS[916]},
+    {"name": "875 (21K Jewelry)", "value": 875, "multiplier": PURITY_MULTIPLIERS[875]},
+    {"name": "750 (18K Jewelry)", "value": 750, "multiplier": PURITY_MULTIPLIERS[750]},
+    {"name": "990 (99.0% Pure Gold)", "value": 990, "multiplier": PURITY_MULTIPLIERS[990]},
+    {"name": "Custom", "value": "custom", "multiplier": PURITY_MULTIPLIERS["custom"]}
 ]
 
 # PRESETS
@@ -174,25 +241,112 @@ PREMIUM_AMOUNTS = [0, 1, 2, 3, 4, 5, 10, 15, 20, 25, 30, 40, 50, 75, 100, 150, 2
 DISCOUNT_AMOUNTS = [0, 1, 2, 3, 4, 5, 10, 15, 20, 25, 30, 40, 50, 75, 100, 150, 200]
 CUSTOM_RATE_PRESETS = [2600, 2620, 2640, 2650, 2660, 2680, 2700, 2720, 2750, 2800]
 
+class SessionStore:
+    """Thread-safe user_id -> session dict with idle expiry and an LRU size cap"""
+    
+    def __init__(self, maxsize=10000, ttl=1800):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._data = OrderedDict()  # user_id -> (last_access, session), oldest first
+    
+    def _purge(self, now):
+        while self._data:
+            user_id, (last_access, _) = next(iter(self._data.items()))
+            if len(self._data) <= self.maxsize and now - last_access < self.ttl:
+                break
+            del self._data[user_id]
+    
+    def get(self, user_id, default=None):
+        with self._lock:
+            now = time.monotonic()
+            self._purge(now)
+            entry = self._data.get(user_id)
+            if entry is None:
+                return default
+            self._data[user_id] = (now, entry[1])
+            self._data.move_to_end(user_id)
+            return entry[1]
+    
+    def __setitem__(self, user_id, session):
+        with self._lock:
+            now = time.monotonic()
+            self._data.pop(user_id, None)
+            self._data[user_id] = (now, session)
+            self._purge(now)
+    
+    def pop(self, user_id, default=None):
+        with self._lock:
+            entry = self._data.pop(user_id, None)
+            return default if entry is None else entry[1]
+    
+    def __contains__(self, user_id):
+        return self.get(user_id) is not None
+    
+    def __len__(self):
+        with self._lock:
+            self._purge(time.monotonic())
+            return len(self._data)
+
+class RecentTrades:
+    """Thread-safe trade_id -> trade keeping only the newest `maxlen`; approved_count also counts evicted ones"""
+    
+    def __init__(self, maxlen=500):
+        self.maxlen = maxlen
+        self._lock = threading.Lock()
+        self._data = OrderedDict()  # oldest first
+        self._approved_count = 0
+    
+    def __setitem__(self, trade_id, trade):
+        with self._lock:
+            if trade_id not in self._data:
+                self._approved_count += 1
+            self._data[trade_id] = trade
+            if len(self._data) > self.maxlen:
+                self._data.popitem(last=False)
+    
+    def pop(self, trade_id, default=None):
+        with self._lock:
+            if trade_id not in self._data:
+                return default
+            self._approved_count -= 1
+            return self._data.pop(trade_id)
+    
+    @property
+    def approved_count(self):
+        """Trades approved and not deleted since start-up, including ones evicted from memory"""
+        return self._approved_count
+    
+    def __len__(self):
+        with self._lock:
+            return len(self._data)
+
 # Global state
-user_sessions = {}
+user_sessions = SessionStore(maxsize=10000, ttl=1800)  # 30 min idle expiry
 market_data = {
     "gold_usd_oz": 2650.0, 
-    "last_update": "00:00:00", 
+    "last_update_epoch": None,  # time.time() of the last successful update, formatted on read
     "trend": "stable", 
     "change_24h": 0.0,
     "source": "initial"
 }
 pending_trades = {}
-approved_trades = {}
+approved_trades = RecentTrades(maxlen=500)  # finally approved trades live in the sheet; keep only recent ones in memory
 unfixed_trades = {}
 
 # ============================================================================
 # UTILITY FUNCTIONS
 # ============================================================================
 
+# Plain decimal text - converted directly; anything else goes through float()'s own parsing
+FLOAT_TEXT_RE = re.compile(r'\s*[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?\s*')
+
 def safe_float(value, default=0.0):
     """Safely convert value to float"""
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str) and FLOAT_TEXT_RE.fullmatch(value):
+        return float(value)
     try:
         if value is None:
             return default
@@ -200,27 +354,49 @@ def safe_float(value, default=0.0):
     except (ValueError, TypeError):
         return default
 
+# Telegram rejects messages over 4096 chars - budget for the comments block of trade review
+COMMENTS_TEXT_BUDGET = 2500
+
+def join_capped(lines, budget, overflow_line="• ...[truncated]"):
+    """Join lines with newlines, stopping early once the text would exceed budget"""
+    parts = []
+    total_len = 0
+    for line in lines:
+        total_len += len(line) + 1
+        if total_len > budget:
+            parts.append(overflow_line)
+            break
+        parts.append(line)
+    return "\n".join(parts)
+
 def log_message(msg):
     """Cloud-safe logging"""
     logger.info(msg)
 
+@functools.lru_cache(maxsize=4096)
+def _format_signed_money(amount, currency):
+    """'$1,234.50' / '-$1,234.50' - repeat amounts (rates, totals re-rendered per tap) hit the cache"""
+    return f"{currency}{amount:,.2f}" if amount >= 0 else f"-{currency}{abs(amount):,.2f}"
+
 def format_money(amount, currency="$"):
     """Format currency with error handling"""
     try:
-        amount = safe_float(amount)
-        return f"{currency}{amount:,.2f}" if amount >= 0 else f"-{currency}{abs(amount):,.2f}"
+        return _format_signed_money(safe_float(amount), currency)
     except Exception:
         return f"{currency}0.00"
 
 def format_money_aed(amount_usd):
     """Convert USD to AED with proper formatting"""
     try:
-        amount_usd = safe_float(amount_usd)
-        amount_aed = amount_usd * USD_TO_AED_RATE
-        return f"AED {amount_aed:,.2f}" if amount_aed >= 0 else f"-AED {abs(amount_aed):,.2f}"
+        return _format_signed_money(safe_float(amount_usd) * USD_TO_AED_RATE, "AED ")
     except Exception:
         return "AED 0.00"
 
+@functools.lru_cache(maxsize=8)
+def market_rate_text(gold_usd_oz):
+    """(USD, AED) display strings for a market rate - the rate only changes on each poll"""
+    return format_money(gold_usd_oz), format_money_aed(gold_usd_oz)
+
 def format_weight_kg(kg):
     """Format weight in KG"""
     try:
@@ -264,8 +440,6 @@ def kg_to_oz(kg):
 
 def get_purity_multiplier(purity_value):
     """Get the verified multiplier for a given purity"""
-    if purity_value == "custom":
-        return PURITY_MULTIPLIERS["custom"]
     return PURITY_MULTIPLIERS.get(purity_value, PURITY_MULTIPLIERS["custom"])
 
 # ============================================================================
@@ -277,10 +451,10 @@ def register_telegram_id(dealer_pin, telegram_id):
     try:
         if dealer_pin in DEALERS:
             DEALERS[dealer_pin]["telegram_id"] = telegram_id
-            logger.info(f"✅ Registered Telegram ID for {DEALERS[dealer_pin]['name']}: {telegram_id}")
+            logger.info("✅ Registered Telegram ID for %s: %s", DEALERS[dealer_pin]['name'], telegram_id)
             return True
     except Exception as e:
-        logger.error(f"❌ Error registering Telegram ID: {e}")
+        logger.error("❌ Error registering Telegram ID: %s", e)
     return False
 
 def send_telegram_notification(telegram_id, message):
@@ -288,109 +462,169 @@ def send_telegram_notification(telegram_id, message):
     try:
         if telegram_id:
             bot.send_message(telegram_id, message, parse_mode='HTML')
-            logger.info(f"✅ Notification sent to {telegram_id}")
+            logger.info("✅ Notification sent to %s", telegram_id)
             return True
     except Exception as e:
-        logger.error(f"❌ Failed to send notification to {telegram_id}: {e}")
+        logger.error("❌ Failed to send notification to %s: %s", telegram_id, e)
     return False
 
-def notify_approvers(trade_session, stage="new"):
-    """Send notifications to appropriate approvers based on stage"""
-    try:
-        if stage == "new":
-            abhay_id = DEALERS.get("1001", {}).get("telegram_id")
-            if abhay_id:
-                message = f"""🔔 <b>NEW TRADE APPROVAL REQUIRED</b>
+# Approver notifications run here so the approving user's reply doesn't wait on other chats
+_notify_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="notify")
+
+# Approver notification per workflow stage: (recipient PINs, template).
+# Rendered once per notification with str.format_map, however many recipients.
+APPROVER_NOTIFICATIONS = {
+    "new": (("1001",), """🔔 <b>NEW TRADE APPROVAL REQUIRED</b>
 
 👤 Hello <b>ABHAY (Head Accountant)</b>,
 
 📊 <b>TRADE DETAILS:</b>
-• Operation: <b>{trade_session.operation.upper()}</b>
-• Customer: <b>{trade_session.customer}</b>
-• Gold Type: <b>{trade_session.gold_type['name']}</b>
-• Volume: <b>{format_weight_combined(trade_session.volume_kg)}</b>
-• Amount: <b>{format_money_aed(trade_session.price)}</b>
-• Dealer: <b>{trade_session.dealer['name']}</b>
+• Operation: <b>{operation}</b>
+• Customer: <b>{customer}</b>
+• Gold Type: <b>{gold_type}</b>
+• Volume: <b>{volume}</b>
+• Amount: <b>{amount}</b>
+• Dealer: <b>{dealer}</b>
 
-⏰ Time: <b>{get_uae_time().strftime('%Y-%m-%d %H:%M:%S')} UAE</b>
+⏰ Time: <b>{time} UAE</b>
 
 🎯 <b>ACTION NEEDED:</b> Please review and approve this trade in the Gold Trading Bot.
 
-💡 Use /start to access the Approval Dashboard."""
-                send_telegram_notification(abhay_id, message)
-        
-        elif stage == "abhay_approved":
-            mushtaq_id = DEALERS.get("1002", {}).get("telegram_id")
-            if mushtaq_id:
-                message = f"""✅ <b>TRADE APPROVED - YOUR TURN</b>
+💡 Use /start to access the Approval Dashboard."""),
+    "abhay_approved": (("1002",), """✅ <b>TRADE APPROVED - YOUR TURN</b>
 
 👤 Hello <b>MUSHTAQ (Level 2 Approver)</b>,
 
 🎉 <b>ABHAY</b> has approved a trade. It now requires your approval:
 
 📊 <b>TRADE DETAILS:</b>
-• Operation: <b>{trade_session.operation.upper()}</b>
-• Customer: <b>{trade_session.customer}</b>
-• Amount: <b>{format_money_aed(trade_session.price)}</b>
+• Operation: <b>{operation}</b>
+• Customer: <b>{customer}</b>
+• Amount: <b>{amount}</b>
 • Previous Approver: <b>Abhay ✅</b>
 
-⏰ Time: <b>{get_uae_time().strftime('%Y-%m-%d %H:%M:%S')} UAE</b>
+⏰ Time: <b>{time} UAE</b>
 
 🎯 <b>ACTION NEEDED:</b> Please review and approve this trade.
 
-💡 Use /start to access the Approval Dashboard."""
-                send_telegram_notification(mushtaq_id, message)
-        
-        elif stage == "mushtaq_approved":
-            ahmadreza_id = DEALERS.get("1003", {}).get("telegram_id")
-            if ahmadreza_id:
-                message = f"""🎯 <b>FINAL APPROVAL REQUIRED</b>
+💡 Use /start to access the Approval Dashboard."""),
+    "mushtaq_approved": (("1003",), """🎯 <b>FINAL APPROVAL REQUIRED</b>
 
 👤 Hello <b>AHMADREZA (Final Approver)</b>,
 
 🎉 Trade has been approved by <b>ABHAY</b> and <b>MUSHTAQ</b>. Your final approval is needed:
 
 📊 <b>TRADE DETAILS:</b>
-• Operation: <b>{trade_session.operation.upper()}</b>
-• Customer: <b>{trade_session.customer}</b>
-• Amount: <b>{format_money_aed(trade_session.price)}</b>
+• Operation: <b>{operation}</b>
+• Customer: <b>{customer}</b>
+• Amount: <b>{amount}</b>
 • Previous Approvers: <b>Abhay ✅ Mushtaq ✅</b>
 
-⏰ Time: <b>{get_uae_time().strftime('%Y-%m-%d %H:%M:%S')} UAE</b>
+⏰ Time: <b>{time} UAE</b>
 
 🎯 <b>ACTION NEEDED:</b> Please give final approval to complete this trade.
 
-💡 Use /start to access the Approval Dashboard."""
-                send_telegram_notification(ahmadreza_id, message)
-        
-        elif stage == "final_approved":
-            for pin in ["1001", "1002", "1003"]:
-                telegram_id = DEALERS.get(pin, {}).get("telegram_id")
-                if telegram_id:
-                    message = f"""🎉 <b>TRADE FINAL APPROVAL COMPLETED</b>
+💡 Use /start to access the Approval Dashboard."""),
+    "final_approved": (("1001", "1002", "1003"), """🎉 <b>TRADE FINAL APPROVAL COMPLETED</b>
 
 ✅ A trade has been <b>FINALLY APPROVED</b> and is ready for execution:
 
 📊 <b>TRADE DETAILS:</b>
-• Operation: <b>{trade_session.operation.upper()}</b>
-• Customer: <b>{trade_session.customer}</b>
-• Amount: <b>{format_money_aed(trade_session.price)}</b>
+• Operation: <b>{operation}</b>
+• Customer: <b>{customer}</b>
+• Amount: <b>{amount}</b>
 • Status: <b>✅ FINAL APPROVED</b>
 
 🎯 Trade is now complete and ready for execution.
 
-⏰ Time: <b>{get_uae_time().strftime('%Y-%m-%d %H:%M:%S')} UAE</b>
+⏰ Time: <b>{time} UAE</b>
+
+🚀 Gold Trading System"""),
+}
 
-🚀 Gold Trading System"""
-                    send_telegram_notification(telegram_id, message)
+def notify_approvers(trade_session, stage="new"):
+    """Send notifications to appropriate approvers based on stage"""
+    try:
+        entry = APPROVER_NOTIFICATIONS.get(stage)
+        if entry is None:
+            return
+        pins, template = entry
+        recipients = [tid for tid in (DEALERS.get(pin, {}).get("telegram_id") for pin in pins) if tid]
+        if not recipients:
+            return
+        
+        message = template.format_map({
+            'operation': trade_session.operation.upper(),
+            'customer': trade_session.customer,
+            'gold_type': trade_session.gold_type['name'],
+            'volume': format_weight_combined(trade_session.volume_kg),
+            'amount': format_money_aed(trade_session.price),
+            'dealer': trade_session.dealer['name'],
+            'time': uae_timestamp(),
+        })
+        for telegram_id in recipients:
+            send_telegram_notification(telegram_id, message)
         
     except Exception as e:
-        logger.error(f"❌ Error sending approver notifications: {e}")
+        logger.error("❌ Error sending approver notifications: %s", e)
 
 # ============================================================================
 # CALCULATION FUNCTIONS
 # ============================================================================
 
+class GoldCalcResult(NamedTuple):
+    """Per-gram calculation result of calculate_professional_gold_trade"""
+    weight_grams: float
+    purity_value: float
+    multiplier: float
+    final_rate_usd_per_oz: float
+    rate_source: str
+    aed_per_gram: float
+    total_aed: float
+    total_usd: float
+    pure_gold_grams: float
+    pure_gold_oz: float
+
+class TradeTotals(NamedTuple):
+    """Trade-level totals of calculate_trade_totals_with_override"""
+    pure_gold_kg: float
+    pure_gold_oz: float
+    total_price_usd: float
+    total_price_aed: float
+    final_rate_usd_per_oz: float
+    final_rate_aed_per_oz: float
+    market_rate_usd_per_oz: float
+    market_rate_aed_per_oz: float
+    market_total_usd: float
+    market_total_aed: float
+    rate_source: str
+
+# Bad inputs the calculation can actually raise on - anything else is a bug and should surface
+CALC_ERRORS = (TypeError, ValueError, ZeroDivisionError)
+
+def _empty_calc_result(rate_source):
+    return GoldCalcResult(0, 999, 0.118122, 0, rate_source, 0, 0, 0, 0, 0)
+
+def _calc_core(weight_grams, purity_factor, multiplier, rate_usd_per_oz):
+    """Numeric core on plain floats -> (aed_per_gram, total_aed, total_usd, pure_gold_grams, pure_gold_oz)
+
+    The purity multipliers already fold in the USD->AED rate.
+    """
+    aed_per_gram = rate_usd_per_oz * multiplier
+    total_aed = aed_per_gram * weight_grams
+    total_usd = total_aed / USD_TO_AED_RATE
+    pure_gold_grams = weight_grams * (purity_factor / 10000)
+    pure_gold_oz = pure_gold_grams / TROY_OUNCE_TO_GRAMS if pure_gold_grams > 0 else 0
+    return aed_per_gram, total_aed, total_usd, pure_gold_grams, pure_gold_oz
+
+@functools.lru_cache(maxsize=32)
+def resolve_purity(purity_value):
+    """Purity value -> (purity_factor, multiplier), custom multiplier for unknown values"""
+    lookup = PURITY_LOOKUP.get(purity_value)
+    if lookup:
+        return lookup
+    return safe_float(purity_value), PURITY_MULTIPLIERS["custom"]
+
 def calculate_professional_gold_trade(weight_grams, purity_value, final_rate_usd_per_oz, rate_source="direct"):
     """MATHEMATICALLY VERIFIED PROFESSIONAL GOLD TRADING CALCULATION"""
     try:
@@ -398,47 +632,30 @@ def calculate_professional_gold_trade(weight_grams, purity_value, final_rate_usd
         final_rate_usd_per_oz = safe_float(final_rate_usd_per_oz)
         
         if weight_grams <= 0 or final_rate_usd_per_oz <= 0:
-            return {
-                'weight_grams': 0, 'purity_value': 999, 'multiplier': 0.118122,
-                'final_rate_usd_per_oz': 0, 'rate_source': rate_source,
-                'aed_per_gram': 0, 'total_aed': 0, 'total_usd': 0,
-                'pure_gold_grams': 0, 'pure_gold_oz': 0
-            }
+            return _empty_calc_result(rate_source)
         
-        if purity_value == "custom":
-            multiplier = PURITY_MULTIPLIERS["custom"]
-            purity_factor = 999
-        else:
-            purity_factor = safe_float(purity_value)
-            multiplier = get_purity_multiplier(purity_value)
+        purity_factor, multiplier = resolve_purity(purity_value)
         
         # CALCULATIONS
-        aed_per_gram = final_rate_usd_per_oz * multiplier
-        total_aed = aed_per_gram * weight_grams
-        total_usd = total_aed / USD_TO_AED_RATE
-        pure_gold_grams = weight_grams * (purity_factor / 10000)
-        pure_gold_oz = pure_gold_grams / TROY_OUNCE_TO_GRAMS if pure_gold_grams > 0 else 0
-        
-        return {
-            'weight_grams': weight_grams,
-            'purity_value': purity_factor,
-            'multiplier': multiplier,
-            'final_rate_usd_per_oz': final_rate_usd_per_oz,
-            'rate_source': rate_source,
-            'aed_per_gram': aed_per_gram,
-            'total_aed': total_aed,
-            'total_usd': total_usd,
-            'pure_gold_grams': pure_gold_grams,
-            'pure_gold_oz': pure_gold_oz
-        }
-    except Exception as e:
-        logger.error(f"❌ Calculation error: {e}")
-        return {
-            'weight_grams': 0, 'purity_value': 999, 'multiplier': 0.118122,
-            'final_rate_usd_per_oz': 0, 'rate_source': rate_source,
-            'aed_per_gram': 0, 'total_aed': 0, 'total_usd': 0,
-            'pure_gold_grams': 0, 'pure_gold_oz': 0
-        }
+        aed_per_gram, total_aed, total_usd, pure_gold_grams, pure_gold_oz = _calc_core(
+            weight_grams, purity_factor, multiplier, final_rate_usd_per_oz
+        )
+        
+        return GoldCalcResult(
+            weight_grams=weight_grams,
+            purity_value=purity_factor,
+            multiplier=multiplier,
+            final_rate_usd_per_oz=final_rate_usd_per_oz,
+            rate_source=rate_source,
+            aed_per_gram=aed_per_gram,
+            total_aed=total_aed,
+            total_usd=total_usd,
+            pure_gold_grams=pure_gold_grams,
+            pure_gold_oz=pure_gold_oz
+        )
+    except CALC_ERRORS as e:
+        logger.error("❌ Calculation error: %s", e)
+        return _empty_calc_result(rate_source)
 
 def calculate_trade_totals_with_override(volume_kg, purity_value, final_rate_usd, rate_source="direct"):
     """COMPLETE TRADE CALCULATION FUNCTION"""
@@ -446,37 +663,36 @@ def calculate_trade_totals_with_override(volume_kg, purity_value, final_rate_usd
         weight_grams = kg_to_grams(volume_kg)
         calc_results = calculate_professional_gold_trade(weight_grams, purity_value, final_rate_usd, rate_source)
         
-        pure_gold_kg = calc_results['pure_gold_grams'] / 1000 if calc_results['pure_gold_grams'] > 0 else 0
-        pure_gold_oz = calc_results['pure_gold_oz']
-        total_price_usd = calc_results['total_usd']
-        total_price_aed = calc_results['total_aed']
+        pure_gold_kg = calc_results.pure_gold_grams / 1000 if calc_results.pure_gold_grams > 0 else 0
+        pure_gold_oz = calc_results.pure_gold_oz
+        total_price_usd = calc_results.total_usd
+        total_price_aed = calc_results.total_aed
         final_rate_aed_per_oz = final_rate_usd * USD_TO_AED_RATE
         
         market_rate_usd = market_data['gold_usd_oz']
         market_rate_aed_per_oz = market_rate_usd * USD_TO_AED_RATE
-        market_calc = calculate_professional_gold_trade(weight_grams, purity_value, market_rate_usd, "market")
-        
-        return {
-            'pure_gold_kg': pure_gold_kg,
-            'pure_gold_oz': pure_gold_oz,
-            'total_price_usd': total_price_usd,
-            'total_price_aed': total_price_aed,
-            'final_rate_usd_per_oz': final_rate_usd,
-            'final_rate_aed_per_oz': final_rate_aed_per_oz,
-            'market_rate_usd_per_oz': market_rate_usd,
-            'market_rate_aed_per_oz': market_rate_aed_per_oz,
-            'market_total_usd': market_calc['total_usd'],
-            'market_total_aed': market_calc['total_aed'],
-            'rate_source': rate_source
-        }
-    except Exception as e:
-        logger.error(f"❌ Trade calculation error: {e}")
-        return {
-            'pure_gold_kg': 0, 'pure_gold_oz': 0, 'total_price_usd': 0, 'total_price_aed': 0,
-            'final_rate_usd_per_oz': 0, 'final_rate_aed_per_oz': 0,
-            'market_rate_usd_per_oz': market_data['gold_usd_oz'], 'market_rate_aed_per_oz': 0,
-            'market_total_usd': 0, 'market_total_aed': 0, 'rate_source': rate_source
-        }
+        if final_rate_usd == market_rate_usd:
+            market_total_usd, market_total_aed = total_price_usd, total_price_aed
+        else:
+            market_calc = calculate_professional_gold_trade(weight_grams, purity_value, market_rate_usd, "market")
+            market_total_usd, market_total_aed = market_calc.total_usd, market_calc.total_aed
+        
+        return TradeTotals(
+            pure_gold_kg=pure_gold_kg,
+            pure_gold_oz=pure_gold_oz,
+            total_price_usd=total_price_usd,
+            total_price_aed=total_price_aed,
+            final_rate_usd_per_oz=final_rate_usd,
+            final_rate_aed_per_oz=final_rate_aed_per_oz,
+            market_rate_usd_per_oz=market_rate_usd,
+            market_rate_aed_per_oz=market_rate_aed_per_oz,
+            market_total_usd=market_total_usd,
+            market_total_aed=market_total_aed,
+            rate_source=rate_source
+        )
+    except CALC_ERRORS as e:
+        logger.error("❌ Trade calculation error: %s", e)
+        return TradeTotals(0, 0, 0, 0, 0, 0, market_data['gold_usd_oz'], 0, 0, 0, rate_source)
 
 def calculate_trade_totals(volume_kg, purity_value, market_rate_usd, pd_type, pd_amount):
     """LEGACY FUNCTION"""
@@ -490,19 +706,63 @@ def calculate_trade_totals(volume_kg, purity_value, market_rate_usd, pd_type, pd
             final_rate = market_rate_usd - pd_amount
         
         return calculate_trade_totals_with_override(volume_kg, purity_value, final_rate, f"market_{pd_type}")
-    except Exception as e:
-        logger.error(f"❌ Legacy calculation error: {e}")
+    except CALC_ERRORS as e:
+        logger.error("❌ Legacy calculation error: %s", e)
         return calculate_trade_totals_with_override(volume_kg, purity_value, 2650, "error")
 
 # ============================================================================
 # GOLD RATE FETCHING
 # ============================================================================
 
+GOLDAPI_URL = 'https://www.goldapi.io/api/XAU/USD'
+
+# Shared HTTP session - keeps the TLS connection to goldapi.io alive between polls
+_rate_http = requests.Session()
+_rate_http.headers.update({'x-access-token': GOLDAPI_KEY})
+# No transport retries - a failed fetch is retried by the updater's backoff and counted by the breaker
+_rate_http.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=2))
+GOLDAPI_TIMEOUT = (3, 7)  # (connect, read) seconds
+
+FIX_RATE_MAX_AGE = 15        # seconds a cached rate stays acceptable for fixing
+RATE_UPDATE_INTERVAL = 120   # seconds between successful polls
+RATE_RETRY_MAX_DELAY = 30    # cap for the exponential retry backoff
+RATE_BREAKER_THRESHOLD = 5   # consecutive failed fetches that open the breaker
+RATE_BREAKER_COOLDOWN = RATE_UPDATE_INTERVAL  # seconds the breaker stays open before the next probe
+
+# Consecutive failures shared by the updater and on-demand refreshes
+_rate_breaker = {"failures": 0, "open_until": 0.0}
+_rate_breaker_lock = threading.Lock()
+
+def _record_rate_fetch(success):
+    """Close the breaker on success; open it for the cooldown once failures reach the threshold"""
+    with _rate_breaker_lock:
+        if success:
+            if _rate_breaker["failures"] >= RATE_BREAKER_THRESHOLD:
+                logger.info("✅ Gold API recovered after %d failed fetches", _rate_breaker["failures"])
+            _rate_breaker["failures"] = 0
+            _rate_breaker["open_until"] = 0.0
+            return
+        _rate_breaker["failures"] += 1
+        if _rate_breaker["failures"] >= RATE_BREAKER_THRESHOLD:
+            if _rate_breaker["failures"] == RATE_BREAKER_THRESHOLD:
+                logger.warning("⚠️ Gold API failed %s times in a row - serving cached rate until it recovers", RATE_BREAKER_THRESHOLD)
+            _rate_breaker["open_until"] = time.time() + RATE_BREAKER_COOLDOWN
+
+def rate_breaker_open():
+    """True while the Gold API is considered down and fetches should be skipped"""
+    return time.time() < _rate_breaker["open_until"]
+
 def fetch_gold_rate():
-    """Fetch current gold rate"""
+    """Fetch current gold rate, recording the outcome for the breaker"""
+    success = _fetch_gold_rate_once()
+    _record_rate_fetch(success)
+    return success
+
+def _fetch_gold_rate_once():
+    """One goldapi.io request - publishes the new rate into market_data on success"""
+    global market_data
     try:
-        headers = {'x-access-token': GOLDAPI_KEY}
-        response = requests.get('https://www.goldapi.io/api/XAU/USD', headers=headers, timeout=10)
+        response = _rate_http.get(GOLDAPI_URL, timeout=GOLDAPI_TIMEOUT)
         
         if response.status_code == 200:
             data = response.json()
@@ -512,60 +772,146 @@ def fetch_gold_rate():
                 old_rate = market_data['gold_usd_oz']
                 change = new_rate - old_rate
                 
-                uae_time = get_uae_time()
-                market_data.update({
+                # Publish a complete new dict in one rebinding so readers never see a half-updated rate
+                market_data = {
+                    **market_data,
                     "gold_usd_oz": round(new_rate, 2),
-                    "last_update": uae_time.strftime('%H:%M:%S'),
+                    "last_update_epoch": time.time(),
                     "trend": "up" if change > 0 else "down" if change < 0 else "stable",
                     "change_24h": round(change, 2),
                     "source": "goldapi.io"
-                })
+                }
                 
-                logger.info(f"✅ Gold rate updated: ${new_rate:.2f}/oz (UAE time: {uae_time.strftime('%H:%M:%S')})")
+                logger.info("✅ Gold rate updated: $%.2f/oz", new_rate)
                 return True
         else:
-            logger.warning(f"⚠️ Gold API responded with status {response.status_code}")
+            logger.warning("⚠️ Gold API responded with status %s", response.status_code)
     except Exception as e:
-        logger.error(f"❌ Rate fetch error: {e}")
+        logger.error("❌ Rate fetch error: %s", e)
     return False
 
+def refresh_gold_rate(max_age):
+    """Fetch the gold rate only if the cached one is older than max_age seconds"""
+    epoch = market_data['last_update_epoch']
+    if epoch is not None and time.time() - epoch < max_age:
+        return True
+    if rate_breaker_open():
+        # API known to be down - keep the cached rate instead of blocking the caller on a fetch
+        return False
+    return fetch_gold_rate()
+
+# main() restarts itself on errors - the updater thread must only ever start once
+_rate_updater_started = False
+_rate_updater_lock = threading.Lock()
+
 def start_rate_updater():
-    """Start background rate updater"""
+    """Start background rate updater (once per process)"""
+    global _rate_updater_started
+    with _rate_updater_lock:
+        if _rate_updater_started:
+            return
+        _rate_updater_started = True
+    
     def update_loop():
         while True:
             try:
-                success = fetch_gold_rate()
-                if success:
-                    logger.info(f"🔄 Rate updated: ${market_data['gold_usd_oz']:.2f} (UAE: {market_data['last_update']})")
-                else:
-                    logger.warning("⚠️ Rate update failed, using cached value")
-                time.sleep(120)  # 2 minutes
+                if fetch_gold_rate():
+                    logger.info("🔄 Rate updated: $%.2f (UAE: %s)", market_data['gold_usd_oz'], format_last_update(market_data))
+                    time.sleep(RATE_UPDATE_INTERVAL)
+                    continue
             except Exception as e:
-                logger.error(f"❌ Rate updater error: {e}")
-                time.sleep(60)  # 1 minute on error
+                logger.error("❌ Rate updater error: %s", e)
+            
+            failures = max(1, _rate_breaker["failures"])
+            if failures < RATE_BREAKER_THRESHOLD:
+                # Transient failure - retry soon with exponential backoff and jitter
+                delay = min(RATE_RETRY_MAX_DELAY, 2 ** (failures - 1)) + random.uniform(0, 1)
+                logger.warning("⚠️ Rate update failed, using cached value - retry %s in %.1fs", failures, delay)
+            else:
+                # Breaker open - probe again once the cooldown ends
+                delay = max(1.0, _rate_breaker["open_until"] - time.time())
+            time.sleep(delay)
     
     thread = threading.Thread(target=update_loop, daemon=True)
     thread.start()
     logger.info("✅ Rate updater started - Updates every 2 minutes")
 
-def get_sheets_client():
-    """Get authenticated Google Sheets client"""
+@functools.lru_cache(maxsize=1)
+def _load_gspread():
+    """Import gspread on first Sheets use - keeps the google-auth stack out of bot start-up"""
+    import gspread
+    return gspread
+
+def sheets_api_error():
+    """gspread's APIError class, for except clauses"""
+    return _load_gspread().exceptions.APIError
+
+@functools.lru_cache(maxsize=1)
+def _authorized_sheets_client():
+    """Build the gspread client once per process - credentials refresh their own token"""
+    gspread = _load_gspread()
+    from google.oauth2.service_account import Credentials
+    scope = ['https://www.googleapis.com/auth/spreadsheets', 'https://www.googleapis.com/auth/drive']
+    creds = Credentials.from_service_account_info(GOOGLE_CREDENTIALS, scopes=scope)
+    client = gspread.authorize(creds)
+    # Keep-alive pool sized for every handler thread plus the background sheet writer, so
+    # concurrent callbacks reuse TLS connections instead of opening and discarding extras.
+    # Retries only cover idempotent requests - appends are never replayed. Once they run out the
+    # last 5xx response is handed back, so gspread still raises APIError for the except branches.
+    client.session.mount('https://', HTTPAdapter(
+        pool_connections=2,
+        pool_maxsize=BOT_WORKER_THREADS + 2,
+        max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=(502, 503, 504), raise_on_status=False)
+    ))
+    return client
+
+# Monthly trade worksheets by name - saves the tab lookup round-trip per trade
+_trade_worksheets = {}
+
+@functools.lru_cache(maxsize=1)
+def _open_trading_spreadsheet():
+    """Open the trading spreadsheet once per process"""
+    return _authorized_sheets_client().open_by_key(GOOGLE_SHEET_ID)
+
+def get_spreadsheet():
+    """Get the trading spreadsheet handle, None on failure"""
     try:
-        scope = ['https://www.googleapis.com/auth/spreadsheets', 'https://www.googleapis.com/auth/drive']
-        creds = Credentials.from_service_account_info(GOOGLE_CREDENTIALS, scopes=scope)
-        return gspread.authorize(creds)
+        # Failures raise and are not cached, so the next call retries
+        return _open_trading_spreadsheet()
     except Exception as e:
-        logger.error(f"❌ Sheets client error: {e}")
+        logger.error("❌ Sheets client error: %s", e)
         return None
 
+def open_worksheet(spreadsheet, sheet_name):
+    """Existing worksheet by name, reusing the cached handle (raises if the sheet doesn't exist)"""
+    worksheet = _trade_worksheets.get(sheet_name)
+    if worksheet is None:
+        worksheet = spreadsheet.worksheet(sheet_name)
+        _trade_worksheets[sheet_name] = worksheet
+    return worksheet
+
+def read_sheet_rows(spreadsheet, sheet_name, *row_numbers):
+    """Given 1-based rows of a sheet in one values.batchGet - [] for a row past the data"""
+    response = spreadsheet.values_batch_get([f"'{sheet_name}'!{n}:{n}" for n in row_numbers])
+    return [(value_range.get('values') or [[]])[0] for value_range in response.get('valueRanges', [])]
+
+def list_sheet_titles(spreadsheet):
+    """Worksheet titles from a metadata fetch trimmed to sheet titles (no grid/format payload)"""
+    metadata = spreadsheet.fetch_sheet_metadata(params={'fields': 'sheets.properties.title'})
+    return [sheet['properties']['title'] for sheet in metadata.get('sheets', [])]
+
+def reset_sheets_cache():
+    """Drop cached spreadsheet/worksheet handles after an API error"""
+    _open_trading_spreadsheet.cache_clear()
+    _trade_worksheets.clear()
+
 def test_sheets_connection():
     """Test Google Sheets connection"""
     try:
-        client = get_sheets_client()
-        if not client:
+        spreadsheet = get_spreadsheet()
+        if spreadsheet is None:
             return False, "Client creation failed"
-            
-        spreadsheet = client.open_by_key(GOOGLE_SHEET_ID)
+        
         worksheets = spreadsheet.worksheets()
         return True, f"Connected ({len(worksheets)} sheets)"
     except Exception as e:
@@ -576,21 +922,32 @@ def test_sheets_connection():
 # ============================================================================
 
 class TradeSession:
+    __slots__ = (
+        'user_id', 'dealer', 'session_id', 'created_at', 'step',
+        'operation', 'gold_type', 'gold_purity', 'volume_kg', 'volume_grams', 'quantity',
+        'customer', 'price', 'rate_per_oz', 'rate_type', 'final_rate_per_oz',
+        'pd_type', 'pd_amount', 'total_aed', 'notes',
+        'approval_status', 'approved_by', 'comments', 'communication_type',
+        'rate_fixed', 'rate_fixed_status', 'unfix_time', 'fixed_time', 'fixed_by',
+        'custom_rate', 'custom_quantity', 'custom_volume', 'custom_pd_amount', 'awaiting_custom_input',
+        '_calc_cache_key', '_calc_cache_val'
+    )
+    
     def __init__(self, user_id, dealer):
         self.user_id = user_id
         self.dealer = dealer
-        self.session_id = f"TRD-{get_uae_time().strftime('%Y%m%d%H%M%S')}-{user_id}"
+        self.created_at = get_uae_time()
+        self.session_id = f"TRD-{self.created_at.strftime('%Y%m%d%H%M%S')}-{user_id}"
         self.reset_trade()
         self.approval_status = "pending"
         self.approved_by = []
         self.comments = []
-        self.created_at = get_uae_time()
         self.communication_type = "Regular"
         self.rate_fixed_status = "Fixed"
         self.unfix_time = None
         self.fixed_time = None
         self.fixed_by = None
-        logger.info(f"✅ Created TradeSession: {self.session_id}")
+        logger.info("✅ Created TradeSession: %s", self.session_id)
     
     def reset_trade(self):
         self.step = "operation"
@@ -620,13 +977,28 @@ class TradeSession:
         self.custom_volume = None
         self.custom_pd_amount = None
         self.awaiting_custom_input = None
+        self._calc_cache_key = None
+        self._calc_cache_val = None
+    
+    def trade_totals(self, final_rate_usd, rate_source):
+        """TradeTotals for this trade, recomputed only when a numeric input or the market rate changes"""
+        key = (self.volume_kg, self.gold_purity['value'], final_rate_usd, market_data['gold_usd_oz'])
+        if key != self._calc_cache_key:
+            self._calc_cache_val = calculate_trade_totals_with_override(
+                self.volume_kg, self.gold_purity['value'], final_rate_usd, rate_source
+            )
+            self._calc_cache_key = key
+        elif self._calc_cache_val.rate_source != rate_source:
+            # Same numbers under a different label (e.g. "market_premium" on save, "market" in review)
+            self._calc_cache_val = self._calc_cache_val._replace(rate_source=rate_source)
+        return self._calc_cache_val
     
     def validate_trade(self):
         """Validate trade"""
         try:
-            required = [self.operation, self.gold_type, self.gold_purity, self.volume_kg, self.customer]
-            
-            if not all(x is not None for x in required):
+            if (self.operation is None or self.gold_type is None or self.gold_purity is None
+                    or self.volume_kg is None or self.customer is None):
+                required = (self.operation, self.gold_type, self.gold_purity, self.volume_kg, self.customer)
                 missing = [str(i) for i, x in enumerate(required) if x is None]
                 return False, f"Missing basic trade information at positions: {missing}"
             
@@ -660,84 +1032,106 @@ class TradeSession:
             
             return True, "Valid"
         except Exception as e:
-            logger.error(f"❌ Validation error: {e}")
+            logger.error("❌ Validation error: %s", e)
             return False, f"Validation failed: {e}"
 
 # ============================================================================
 # UNFIXED TRADES MANAGEMENT
 # ============================================================================
 
+# Unfixed trades scan is a full read of every trade sheet - cache it briefly
+UNFIXED_CACHE_TTL = 30  # seconds
+_unfixed_cache = {"data": None, "ts": 0.0}
+
+def invalidate_unfixed_cache():
+    """Drop cached unfixed trades after a sheet write"""
+    _unfixed_cache["data"] = None
+
 def get_unfixed_trades_from_sheets():
-    """Get all trades with unfixed rates from sheets"""
+    """Get all trades with unfixed rates from sheets (cached for UNFIXED_CACHE_TTL)"""
+    cached = _unfixed_cache["data"]
+    if cached is not None and time.time() - _unfixed_cache["ts"] < UNFIXED_CACHE_TTL:
+        return cached
+    
+    unfixed_list = _fetch_unfixed_trades_from_sheets()
+    if unfixed_list is None:
+        return []
+    
+    _unfixed_cache["data"] = unfixed_list
+    _unfixed_cache["ts"] = time.time()
+    return unfixed_list
+
+def _fetch_unfixed_trades_from_sheets():
+    """Scan all trade sheets for unfixed rates, None on failure"""
     try:
-        client = get_sheets_client()
-        if not client:
-            return []
+        spreadsheet = get_spreadsheet()
+        if spreadsheet is None:
+            return None
         
-        spreadsheet = client.open_by_key(GOOGLE_SHEET_ID)
-        worksheets = spreadsheet.worksheets()
+        sheet_names = [title for title in list_sheet_titles(spreadsheet) if title.startswith("Gold_Trades_")]
         
         unfixed_list = []
+        if not sheet_names:
+            return unfixed_list
+        
+        # One batchGet for all trade sheets instead of a read per sheet - whole sheets, since
+        # columns are located by header and older sheets may not use the standard layout
+        response = spreadsheet.values_batch_get([f"'{name}'" for name in sheet_names])
         
-        for worksheet in worksheets:
-            if worksheet.title.startswith("Gold_Trades_"):
+        for sheet_name, value_range in zip(sheet_names, response.get('valueRanges', [])):
+            all_values = value_range.get('values', [])
+            
+            if len(all_values) > 0:
+                headers = all_values[0]
                 try:
-                    all_values = worksheet.get_all_values()
+                    session_id_col = headers.index('Session ID')
+                    rate_fixed_col = headers.index('Rate Fixed')
+                    operation_col = headers.index('Operation')
+                    customer_col = headers.index('Customer')
+                    volume_col = headers.index('Volume')
+                    gold_type_col = headers.index('Gold Type')
+                    date_col = headers.index('Date')
+                    time_col = headers.index('Time')
                     
-                    if len(all_values) > 0:
-                        headers = all_values[0]
-                        try:
-                            session_id_col = headers.index('Session ID')
-                            rate_fixed_col = headers.index('Rate Fixed')
-                            operation_col = headers.index('Operation')
-                            customer_col = headers.index('Customer')
-                            volume_col = headers.index('Volume')
-                            gold_type_col = headers.index('Gold Type')
-                            date_col = headers.index('Date')
-                            time_col = headers.index('Time')
-                            
-                            for i, row in enumerate(all_values[1:], start=2):
-                                if len(row) > rate_fixed_col and row[rate_fixed_col] == "No":
-                                    unfixed_list.append({
-                                        'sheet_name': worksheet.title,
-                                        'row_number': i,
-                                        'session_id': row[session_id_col] if len(row) > session_id_col else "",
-                                        'operation': row[operation_col] if len(row) > operation_col else "",
-                                        'customer': row[customer_col] if len(row) > customer_col else "",
-                                        'volume': row[volume_col] if len(row) > volume_col else "",
-                                        'gold_type': row[gold_type_col] if len(row) > gold_type_col else "",
-                                        'date': row[date_col] if len(row) > date_col else "",
-                                        'time': row[time_col] if len(row) > time_col else ""
-                                    })
-                        except ValueError:
-                            logger.warning(f"⚠️ Required columns not found in sheet {worksheet.title}")
-                            
-                except Exception as e:
-                    logger.error(f"❌ Error reading sheet {worksheet.title}: {e}")
+                    for i, row in enumerate(all_values[1:], start=2):
+                        if len(row) > rate_fixed_col and row[rate_fixed_col] == "No":
+                            unfixed_list.append({
+                                'sheet_name': sheet_name,
+                                'row_number': i,
+                                'session_id': row[session_id_col] if len(row) > session_id_col else "",
+                                'operation': row[operation_col] if len(row) > operation_col else "",
+                                'customer': row[customer_col] if len(row) > customer_col else "",
+                                'volume': row[volume_col] if len(row) > volume_col else "",
+                                'gold_type': row[gold_type_col] if len(row) > gold_type_col else "",
+                                'date': row[date_col] if len(row) > date_col else "",
+                                'time': row[time_col] if len(row) > time_col else ""
+                            })
+                except ValueError:
+                    logger.warning("⚠️ Required columns not found in sheet %s", sheet_name)
         
         return unfixed_list
         
     except Exception as e:
-        logger.error(f"❌ Error getting unfixed trades: {e}")
-        return []
+        logger.error("❌ Error getting unfixed trades: %s", e)
+        return None
+
+FIX_SUCCESS_HEADER = "Rate Successfully Fixed!"
 
 def fix_trade_rate(sheet_name, row_number, rate_type, base_rate, pd_type, pd_amount, fixed_by):
     """FIXED: Enhanced rate fixing with better feedback"""
     try:
-        client = get_sheets_client()
-        if not client:
+        spreadsheet = get_spreadsheet()
+        if spreadsheet is None:
             return False, "Sheets client failed"
         
-        spreadsheet = client.open_by_key(GOOGLE_SHEET_ID)
-        worksheet = spreadsheet.worksheet(sheet_name)
+        worksheet = open_worksheet(spreadsheet, sheet_name)
         
-        # Get current row data
-        all_values = worksheet.get_all_values()
-        if row_number < 2 or row_number > len(all_values):
+        # Header row and the trade's row only - not the whole sheet
+        if row_number < 2:
+            return False, "Invalid row number"
+        headers, row_data = read_sheet_rows(spreadsheet, sheet_name, 1, row_number)
+        if not row_data:
             return False, "Invalid row number"
-        
-        headers = all_values[0]
-        row_data = all_values[row_number - 1]
         
         # Get column indices
         try:
@@ -796,12 +1190,13 @@ def fix_trade_rate(sheet_name, row_number, rate_type, base_rate, pd_type, pd_amo
             f"fixed_{rate_type}"
         )
         
-        total_aed = calc_results['total_price_aed']
-        total_usd = calc_results['total_price_usd']
+        total_aed = calc_results.total_price_aed
+        total_usd = calc_results.total_price_usd
         
         # Get current notes and add fix information
+        fixed_at_str = uae_timestamp()
         current_notes = row_data[notes_col - 1] if len(row_data) >= notes_col else ""
-        fix_note = f"RATE FIXED: {get_uae_time().strftime('%Y-%m-%d %H:%M')} by {fixed_by} - {rate_type.upper()} ${base_rate:.2f} {pd_display}"
+        fix_note = f"RATE FIXED: {fixed_at_str[:16]} by {fixed_by} - {rate_type.upper()} ${base_rate:.2f} {pd_display}"
         new_notes = f"{current_notes} | {fix_note}" if current_notes else f"v4.9.3 UAE | {fix_note}"
         
         # FIXED: Update all relevant columns with proper formatting
@@ -832,7 +1227,7 @@ def fix_trade_rate(sheet_name, row_number, rate_type, base_rate, pd_type, pd_amo
             },
             {
                 'range': f'{col_num_to_letter(fixed_time_col)}{row_number}',
-                'values': [[get_uae_time().strftime('%Y-%m-%d %H:%M:%S')]]
+                'values': [[fixed_at_str]]
             },
             {
                 'range': f'{col_num_to_letter(fixed_by_col)}{row_number}',
@@ -841,29 +1236,55 @@ def fix_trade_rate(sheet_name, row_number, rate_type, base_rate, pd_type, pd_amo
         ]
         
         worksheet.batch_update(updates)
+        invalidate_unfixed_cache()
         
         # FIXED: Better feedback message with all details
-        success_message = f"""Rate Successfully Fixed!
-• Final Rate: ${final_rate_usd:,.2f}/oz
-• Base Rate: ${base_rate:.2f} ({rate_type.upper()})
-• P/D: {pd_display}
-• Total USD: ${total_usd:,.2f}
-• Total AED: AED {total_aed:,.2f}
-• Volume: {volume_kg:.3f} KG
-• Fixed By: {fixed_by}
-• Time: {get_uae_time().strftime('%Y-%m-%d %H:%M:%S')} UAE"""
-        
-        logger.info(f"✅ Fixed rate for trade in row {row_number}: ${final_rate_usd:.2f}/oz")
+        success_message = "\n".join([
+            FIX_SUCCESS_HEADER,
+            f"• Final Rate: ${final_rate_usd:,.2f}/oz",
+            f"• Base Rate: ${base_rate:.2f} ({rate_type.upper()})",
+            f"• P/D: {pd_display}",
+            f"• Total USD: ${total_usd:,.2f}",
+            f"• Total AED: AED {total_aed:,.2f}",
+            f"• Volume: {volume_kg:.3f} KG",
+            f"• Fixed By: {fixed_by}",
+            f"• Time: {fixed_at_str} UAE"
+        ])
+        
+        logger.info("✅ Fixed rate for trade in row %s: $%.2f/oz", row_number, final_rate_usd)
         return True, success_message
         
+    except sheets_api_error() as e:
+        reset_sheets_cache()
+        logger.error("❌ Sheets API error fixing trade rate: %s", e)
+        return False, f"Fix failed: {str(e)}"
     except Exception as e:
-        logger.error(f"❌ Error fixing trade rate: {e}")
+        logger.error("❌ Error fixing trade rate: %s", e)
         return False, f"Fix failed: {str(e)}"
 
 # ============================================================================
 # APPROVAL WORKFLOW FUNCTIONS
 # ============================================================================
 
+# Status writes whose result the user doesn't wait for. One worker keeps them in submit order,
+# and each write reads the trade's current state, so the sheet ends on the latest status.
+_sheets_write_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sheets")
+
+def _log_status_update_result(session_id, future):
+    """Done-callback for queued status writes - callers don't wait, so failures surface here"""
+    try:
+        success, message = future.result()
+    except Exception as e:
+        success, message = False, str(e)
+    if not success:
+        logger.error("❌ Queued sheet status update failed for %s: %s", session_id, message)
+
+def queue_status_update(trade):
+    """Write the trade's approval columns in the background"""
+    future = _sheets_write_pool.submit(update_trade_status_in_sheets, trade)
+    future.add_done_callback(functools.partial(_log_status_update_result, trade.session_id))
+    return future
+
 def get_pending_trades():
     """Get all pending trades for approval"""
     return {k: v for k, v in pending_trades.items() if v.approval_status in ["pending", "abhay_approved", "mushtaq_approved"]}
@@ -871,34 +1292,34 @@ def get_pending_trades():
 def approve_trade(trade_id, approver_name, comment=""):
     """Approve a trade and advance workflow"""
     try:
-        if trade_id not in pending_trades:
+        trade = pending_trades.get(trade_id)
+        if trade is None:
             return False, "Trade not found"
         
-        trade = pending_trades[trade_id]
-        
         trade.approved_by.append(approver_name)
         if comment:
             trade.comments.append(f"{approver_name}: {comment}")
         
         if approver_name == "Abhay" and trade.approval_status == "pending":
             trade.approval_status = "abhay_approved"
-            update_trade_status_in_sheets(trade)
-            notify_approvers(trade, "abhay_approved")
-            return True, "Approved by Abhay. Sheet status updated. Notified Mushtaq."
+            _notify_pool.submit(notify_approvers, trade, "abhay_approved")
+            queue_status_update(trade)
+            return True, "Approved by Abhay. Sheet status update queued. Notified Mushtaq."
         
         elif approver_name == "Mushtaq" and trade.approval_status == "abhay_approved":
             trade.approval_status = "mushtaq_approved"
-            update_trade_status_in_sheets(trade)
-            notify_approvers(trade, "mushtaq_approved")
-            return True, "Approved by Mushtaq. Sheet status updated. Notified Ahmadreza for final approval."
+            _notify_pool.submit(notify_approvers, trade, "mushtaq_approved")
+            queue_status_update(trade)
+            return True, "Approved by Mushtaq. Sheet status update queued. Notified Ahmadreza for final approval."
         
         elif approver_name == "Ahmadreza" and trade.approval_status == "mushtaq_approved":
             trade.approval_status = "final_approved"
-            success, sheet_result = update_trade_status_in_sheets(trade)
+            # Final stage waits for the write (behind any queued ones) - the trade only leaves pending on success
+            success, sheet_result = queue_status_update(trade).result()
             if success:
                 approved_trades[trade_id] = trade
                 del pending_trades[trade_id]
-                notify_approvers(trade, "final_approved")
+                _notify_pool.submit(notify_approvers, trade, "final_approved")
                 return True, f"Final approval completed. Sheet status updated to GREEN: {sheet_result}"
             else:
                 return False, f"Final approval given but sheet update failed: {sheet_result}"
@@ -906,324 +1327,355 @@ def approve_trade(trade_id, approver_name, comment=""):
         return False, "Invalid approval workflow step"
         
     except Exception as e:
-        logger.error(f"❌ Approval error: {e}")
+        logger.error("❌ Approval error: %s", e)
         return False, str(e)
 
 def reject_trade(trade_id, rejector_name, reason=""):
     """Reject a trade and update sheets"""
     try:
-        if trade_id not in pending_trades:
+        trade = pending_trades.get(trade_id)
+        if trade is None:
             return False, "Trade not found"
-        
-        trade = pending_trades[trade_id]
         trade.approval_status = "rejected"
         trade.comments.append(f"REJECTED by {rejector_name}: {reason}")
         
-        update_trade_status_in_sheets(trade)
+        queue_status_update(trade)
         del pending_trades[trade_id]
         
         return True, f"Trade rejected by {rejector_name}. Reason: {reason}"
         
     except Exception as e:
-        logger.error(f"❌ Rejection error: {e}")
+        logger.error("❌ Rejection error: %s", e)
         return False, str(e)
 
 def add_comment_to_trade(trade_id, commenter_name, comment):
     """Add comment to trade and update sheets"""
     try:
-        if trade_id not in pending_trades:
+        trade = pending_trades.get(trade_id)
+        if trade is None:
             return False, "Trade not found"
-        
-        trade = pending_trades[trade_id]
         trade.comments.append(f"{commenter_name}: {comment}")
-        update_trade_status_in_sheets(trade)
+        queue_status_update(trade)
         
         return True, f"Comment added by {commenter_name}: {comment}"
         
     except Exception as e:
-        logger.error(f"❌ Comment error: {e}")
+        logger.error("❌ Comment error: %s", e)
         return False, str(e)
 
 def delete_trade_from_approval(trade_id, deleter_name):
     """Delete trade completely from approval workflow"""
     try:
-        if trade_id not in pending_trades:
+        if pending_trades.pop(trade_id, None) is None:
             return False, "Trade not found in approval workflow"
         
-        trade = pending_trades[trade_id]
-        logger.info(f"🗑️ Deleting trade from approval: {trade_id} by {deleter_name}")
-        
-        del pending_trades[trade_id]
-        
-        if trade_id in approved_trades:
-            del approved_trades[trade_id]
+        logger.info("🗑️ Deleting trade from approval: %s by %s", trade_id, deleter_name)
+        approved_trades.pop(trade_id, None)
         
         return True, f"Trade {trade_id[-8:]} completely deleted from approval workflow by {deleter_name}"
         
     except Exception as e:
-        logger.error(f"❌ Delete trade error: {e}")
+        logger.error("❌ Delete trade error: %s", e)
         return False, str(e)
 
 def delete_row_from_sheet(row_number, sheet_name, deleter_name):
     """Delete a specific row from the sheet"""
     try:
-        client = get_sheets_client()
-        if not client:
+        spreadsheet = get_spreadsheet()
+        if spreadsheet is None:
             return False, "Sheets client failed"
-            
-        spreadsheet = client.open_by_key(GOOGLE_SHEET_ID)
-        worksheet = spreadsheet.worksheet(sheet_name)
         
-        all_values = worksheet.get_all_values()
+        worksheet = open_worksheet(spreadsheet, sheet_name)
         
-        if row_number < 2 or row_number > len(all_values):
-            return False, f"Invalid row number. Sheet has {len(all_values)} rows."
+        # Read just the target row - an empty row means it is past the data
+        if row_number < 2 or not read_sheet_rows(spreadsheet, sheet_name, row_number)[0]:
+            return False, f"Invalid row number: row {row_number} has no data."
         
-        row_data = all_values[row_number - 1]
         worksheet.delete_rows(row_number)
+        invalidate_unfixed_cache()
         
-        logger.info(f"🗑️ Deleted row {row_number} from sheet {sheet_name} by {deleter_name}")
+        logger.info("🗑️ Deleted row %s from sheet %s by %s", row_number, sheet_name, deleter_name)
         
         return True, f"Row {row_number} deleted successfully from {sheet_name}"
         
+    except sheets_api_error() as e:
+        reset_sheets_cache()
+        logger.error("❌ Sheets API error deleting row: %s", e)
+        return False, str(e)
     except Exception as e:
-        logger.error(f"❌ Delete row error: {e}")
+        logger.error("❌ Delete row error: %s", e)
         return False, str(e)
 
+# FIXED v4.9.3 HEADERS - EXACT 21 columns matching data
+TRADE_SHEET_HEADERS = (
+    'Date', 'Time', 'Dealer', 'Operation', 'Customer', 'Gold Type', 
+    'Volume', 'Pure Gold', 'Price USD', 'Total AED', 'Final Rate', 
+    'Purity', 'Rate Type', 'P/D Amount', 'Session ID', 'Approval Status', 
+    'Approved By', 'Notes', 'Rate Fixed', 'Fixed Time', 'Fixed By'
+)
+
+def trade_column_letter(header):
+    """Column letter of a standard trade sheet header, e.g. 'Session ID' -> 'O'"""
+    return chr(ord('A') + TRADE_SHEET_HEADERS.index(header))
+
+TRADE_SESSION_ID_LETTER = trade_column_letter('Session ID')
+TRADE_APPROVAL_STATUS_COL = TRADE_SHEET_HEADERS.index('Approval Status')
+TRADE_NOTES_COL = TRADE_SHEET_HEADERS.index('Notes')
+TRADE_RATE_FIXED_COL = TRADE_SHEET_HEADERS.index('Rate Fixed')
+
+# Approval-column background per status (unknown statuses fall back to white)
+APPROVAL_STATUS_FORMATS = {
+    "pending": {"backgroundColor": {"red": 1.0, "green": 0.8, "blue": 0.8}},
+    "abhay_approved": {"backgroundColor": {"red": 1.0, "green": 1.0, "blue": 0.7}},
+    "mushtaq_approved": {"backgroundColor": {"red": 1.0, "green": 0.9, "blue": 0.6}},
+    "final_approved": {"backgroundColor": {"red": 0.8, "green": 1.0, "blue": 0.8}},
+    "rejected": {"backgroundColor": {"red": 0.9, "green": 0.6, "blue": 0.6}},
+}
+DEFAULT_STATUS_FORMAT = {"backgroundColor": {"red": 1.0, "green": 1.0, "blue": 1.0}}
+UNFIXED_RATE_FORMAT = {"backgroundColor": {"red": 1.0, "green": 0.95, "blue": 0.8}}
+
+# spreadsheets.batchUpdate request builders - rows/columns are 0-based, ends exclusive.
+# Collecting these into one batch_update turns several Sheets round-trips into one.
+
+def _row_range(sheet_id, row_index, first_col, last_col):
+    return {"sheetId": sheet_id, "startRowIndex": row_index, "endRowIndex": row_index + 1,
+            "startColumnIndex": first_col, "endColumnIndex": last_col + 1}
+
+def row_text_request(sheet_id, row_index, first_col, texts, cell_format=None):
+    """Write strings into consecutive cells of one row (same as a RAW values write), optionally formatted"""
+    cell_fields = "userEnteredValue"
+    cells = [{"userEnteredValue": {"stringValue": text}} for text in texts]
+    if cell_format:
+        cell_fields += f",userEnteredFormat({','.join(cell_format)})"
+        for cell in cells:
+            cell["userEnteredFormat"] = cell_format
+    return {"updateCells": {
+        "range": _row_range(sheet_id, row_index, first_col, first_col + len(texts) - 1),
+        "rows": [{"values": cells}],
+        "fields": cell_fields
+    }}
+
+def row_format_request(sheet_id, row_index, first_col, last_col, cell_format):
+    """Apply a format to a span of one row - same fields as worksheet.format()"""
+    return {"repeatCell": {
+        "range": _row_range(sheet_id, row_index, first_col, last_col),
+        "cell": {"userEnteredFormat": cell_format},
+        "fields": f"userEnteredFormat({','.join(cell_format)})"
+    }}
+
 def update_trade_status_in_sheets(trade_session):
     """FIXED: Update existing trade status in sheets with proper column mapping"""
     try:
-        logger.info(f"🔄 Updating trade status in sheets: {trade_session.session_id}")
+        logger.info("🔄 Updating trade status in sheets: %s", trade_session.session_id)
         
-        client = get_sheets_client()
-        if not client:
+        spreadsheet = get_spreadsheet()
+        if spreadsheet is None:
             logger.error("❌ Sheets client failed")
             return False, "Sheets client failed"
-            
-        spreadsheet = client.open_by_key(GOOGLE_SHEET_ID)
         
         current_date = get_uae_time()
         sheet_name = f"Gold_Trades_{current_date.strftime('%Y_%m')}"
         
         try:
-            worksheet = spreadsheet.worksheet(sheet_name)
+            worksheet = open_worksheet(spreadsheet, sheet_name)
         except:
-            logger.error(f"❌ Sheet not found: {sheet_name}")
+            logger.error("❌ Sheet not found: %s", sheet_name)
             return False, f"Sheet not found: {sheet_name}"
         
-        # Find the row with this trade session ID
-        all_values = worksheet.get_all_values()
+        # Header row and the standard Session ID column in one batchGet
+        header_range, session_range = spreadsheet.values_batch_get([
+            f"'{sheet_name}'!1:1",
+            f"'{sheet_name}'!{TRADE_SESSION_ID_LETTER}:{TRADE_SESSION_ID_LETTER}",
+        ]).get('valueRanges', [{}, {}])
+        headers = (header_range.get('values') or [[]])[0]
         row_to_update = None
         
-        if len(all_values) > 0:
-            headers = all_values[0]
+        if len(headers) > 0:
             try:
                 session_id_col = headers.index('Session ID')
                 approval_status_col = headers.index('Approval Status')
                 approved_by_col = headers.index('Approved By')
                 notes_col = headers.index('Notes')
             except ValueError as e:
-                logger.error(f"❌ Required column not found: {e}")
+                logger.error("❌ Required column not found: %s", e)
                 return False, f"Required column not found: {e}"
             
-            # Find the row to update
-            for i, row in enumerate(all_values[1:], start=2):
-                if len(row) > session_id_col and row[session_id_col] == trade_session.session_id:
+            # Find the row to update - re-read the column only for a non-standard header layout
+            if tuple(h.strip() for h in headers) == TRADE_SHEET_HEADERS:
+                session_ids = [cells[0] if cells else "" for cells in session_range.get('values', [])]
+            else:
+                session_ids = worksheet.col_values(session_id_col + 1)
+            for i, session_id in enumerate(session_ids[1:], start=2):
+                if session_id == trade_session.session_id:
                     row_to_update = i
                     break
         
         if row_to_update:
-            approval_status = getattr(trade_session, 'approval_status', 'pending')
-            approved_by = getattr(trade_session, 'approved_by', [])
-            comments = getattr(trade_session, 'comments', [])
-            
-            def col_index_to_letter(col_index):
-                """Convert column index to Excel letter"""
-                string = ""
-                col_index += 1  # Convert to 1-based
-                while col_index > 0:
-                    col_index, remainder = divmod(col_index - 1, 26)
-                    string = chr(65 + remainder) + string
-                return string
-            
-            # Update the specific approval columns
-            updates = [
-                {
-                    'range': f'{col_index_to_letter(approval_status_col)}{row_to_update}',
-                    'values': [[approval_status.upper()]]
-                },
-                {
-                    'range': f'{col_index_to_letter(approved_by_col)}{row_to_update}',
-                    'values': [[", ".join(approved_by) if approved_by else "Pending"]]
-                },
-                {
-                    'range': f'{col_index_to_letter(notes_col)}{row_to_update}',
-                    'values': [["v4.9.3 UAE | " + " | ".join(comments) if comments else "v4.9.3 UAE"]]
-                }
-            ]
-            
-            worksheet.batch_update(updates)
+            approval_status = trade_session.approval_status
+            approved_by = trade_session.approved_by
+            comments = trade_session.comments
             
-            # Apply color coding based on status
-            try:
-                if approval_status == "pending":
-                    color_format = {"backgroundColor": {"red": 1.0, "green": 0.8, "blue": 0.8}}
-                elif approval_status == "abhay_approved":
-                    color_format = {"backgroundColor": {"red": 1.0, "green": 1.0, "blue": 0.7}}
-                elif approval_status == "mushtaq_approved":
-                    color_format = {"backgroundColor": {"red": 1.0, "green": 0.9, "blue": 0.6}}
-                elif approval_status == "final_approved":
-                    color_format = {"backgroundColor": {"red": 0.8, "green": 1.0, "blue": 0.8}}
-                elif approval_status == "rejected":
-                    color_format = {"backgroundColor": {"red": 0.9, "green": 0.6, "blue": 0.6}}
-                else:
-                    color_format = {"backgroundColor": {"red": 1.0, "green": 1.0, "blue": 1.0}}
-                
-                # Apply color to approval columns only
-                approval_range = f"{col_index_to_letter(approval_status_col)}{row_to_update}:{col_index_to_letter(notes_col)}{row_to_update}"
-                worksheet.format(approval_range, color_format)
-                logger.info(f"✅ Applied {approval_status} color formatting to row {row_to_update}")
-                
-            except Exception as e:
-                logger.warning(f"⚠️ Color formatting failed for row {row_to_update}: {e}")
+            # Approval columns and their status colour in one batchUpdate
+            sheet_id = worksheet.id
+            row_index = row_to_update - 1
+            spreadsheet.batch_update({"requests": [
+                row_text_request(sheet_id, row_index, approval_status_col, [approval_status.upper()]),
+                row_text_request(sheet_id, row_index, approved_by_col, [", ".join(approved_by) if approved_by else "Pending"]),
+                row_text_request(sheet_id, row_index, notes_col, ["v4.9.3 UAE | " + " | ".join(comments) if comments else "v4.9.3 UAE"]),
+                row_format_request(
+                    sheet_id, row_index, approval_status_col, notes_col,
+                    APPROVAL_STATUS_FORMATS.get(approval_status, DEFAULT_STATUS_FORMAT)
+                ),
+            ]})
+            logger.info("✅ Applied %s color formatting to row %s", approval_status, row_to_update)
             
-            logger.info(f"✅ Trade status updated in sheets: {trade_session.session_id} -> {approval_status}")
+            logger.info("✅ Trade status updated in sheets: %s -> %s", trade_session.session_id, approval_status)
             return True, f"Status updated to {approval_status}"
         else:
-            logger.warning(f"⚠️ Trade not found in sheets: {trade_session.session_id}")
+            logger.warning("⚠️ Trade not found in sheets: %s", trade_session.session_id)
             return False, "Trade not found in sheets"
         
+    except sheets_api_error() as e:
+        reset_sheets_cache()
+        logger.error("❌ Sheets API error updating status: %s", e)
+        return False, str(e)
     except Exception as e:
-        logger.error(f"❌ Update status error: {e}")
+        logger.error("❌ Update status error: %s", e)
         return False, str(e)
 
 # ============================================================================
 # ENHANCED SAVE TRADE FUNCTIONS - FIXED SHEET FORMATTING v4.9.3
 # ============================================================================
 
+# Shared "x.xxx KG (x,xxxg)" cell template for the Volume and Pure Gold columns
+SHEET_WEIGHT_FORMAT = "{:.3f} KG ({:,.0f}g)".format
+
+def get_trade_worksheet(sheet_name):
+    """Open (or create with headers) the monthly trades worksheet, reusing the cached handle"""
+    worksheet = _trade_worksheets.get(sheet_name)
+    if worksheet is not None:
+        return worksheet
+    
+    spreadsheet = get_spreadsheet()
+    if spreadsheet is None:
+        return None
+    
+    try:
+        worksheet = spreadsheet.worksheet(sheet_name)
+        logger.info("✅ Found existing sheet: %s", sheet_name)
+    except:
+        logger.info("🔄 Creating new sheet: %s", sheet_name)
+        worksheet = spreadsheet.add_worksheet(title=sheet_name, rows=1000, cols=21)
+
+        # Header values and formatting in one batchUpdate
+        header_format = {
+            "backgroundColor": {"red": 0.2, "green": 0.2, "blue": 0.8},
+            "textFormat": {"bold": True, "foregroundColor": {"red": 1.0, "green": 1.0, "blue": 1.0}},
+            "horizontalAlignment": "CENTER"
+        }
+        spreadsheet.batch_update({"requests": [row_text_request(worksheet.id, 0, 0, TRADE_SHEET_HEADERS, header_format)]})
+
+        logger.info("✅ Created sheet with FIXED v4.9.3 headers: %s", sheet_name)
+    
+    _trade_worksheets[sheet_name] = worksheet
+    return worksheet
+
+def _appended_row_number(response):
+    """Row number from an append response's updatedRange, e.g. "'Sheet'!A5:U5" -> 5"""
+    updated_range = response['updates']['updatedRange']
+    first_cell = updated_range.rsplit('!', 1)[-1].split(':')[0]
+    return int(first_cell.lstrip('ABCDEFGHIJKLMNOPQRSTUVWXYZ'))
+
+# Rate resolvers for save_trade_to_sheets, by rate_type:
+# (session, market_rate) -> (final_rate, rate_source, rate_description, pd_amount_display)
+
+def _resolve_override_save_rate(session, market_rate):
+    """Dealer's final rate, used as-is"""
+    rate = session.final_rate_per_oz
+    return rate, "override", f"OVERRIDE: ${rate:,.2f}/oz (FINAL)", "N/A (Override)"
+
+def _resolve_unfix_save_rate(session, market_rate):
+    """Market reference, optionally +/- premium/discount, to be fixed later"""
+    pd_type, pd_amount = session.pd_type, session.pd_amount
+    if not pd_type or pd_amount is None:
+        return (market_rate, "unfix",
+                f"UNFIX: Rate to be fixed later (Market ref: ${market_rate:,.2f}/oz)", "N/A (Pure Unfix)")
+    if pd_type == "premium":
+        final_rate, pd_amount_display = market_rate + pd_amount, f"+${pd_amount:.2f} (UNFIX)"
+    else:
+        final_rate, pd_amount_display = market_rate - pd_amount, f"-${pd_amount:.2f} (UNFIX)"
+    return final_rate, "unfix", f"UNFIX: Market ${market_rate:.2f} {pd_amount_display}", pd_amount_display
+
+def _resolve_pd_save_rate(session, market_rate):
+    """Market or custom base rate +/- premium/discount - same rate as calculate_trade_totals"""
+    rate_type, pd_type, pd_amount = session.rate_type, session.pd_type, session.pd_amount
+    base_rate = market_rate if rate_type == "market" else session.custom_rate
+    if pd_type == "premium":
+        final_rate = safe_float(base_rate) + safe_float(pd_amount)
+    else:
+        final_rate = safe_float(base_rate) - safe_float(pd_amount)
+    pd_sign = "+" if pd_type == "premium" else "-"
+    return (final_rate, f"market_{pd_type}",
+            f"{rate_type.upper()}: ${base_rate:,.2f} {pd_sign} ${pd_amount}/oz", f"{pd_sign}${pd_amount:.2f}")
+
+SAVE_RATE_RESOLVERS = {
+    "override": _resolve_override_save_rate,
+    "unfix": _resolve_unfix_save_rate,
+    "market": _resolve_pd_save_rate,
+    "custom": _resolve_pd_save_rate,
+}
+
 def save_trade_to_sheets(session):
     """FIXED: Save trade to Google Sheets with CORRECTED headers and data alignment"""
     try:
-        logger.info(f"🔄 Starting save_trade_to_sheets for {session.session_id}")
+        logger.info("🔄 Starting save_trade_to_sheets for %s", session.session_id)
         
-        client = get_sheets_client()
-        if not client:
+        timestamp = uae_timestamp()
+        sheet_name = f"Gold_Trades_{timestamp[:4]}_{timestamp[5:7]}"
+        logger.info("🔄 Target sheet: %s", sheet_name)
+        
+        worksheet = get_trade_worksheet(sheet_name)
+        if not worksheet:
             logger.error("❌ Sheets client failed")
             return False, "Sheets client failed"
-            
-        spreadsheet = client.open_by_key(GOOGLE_SHEET_ID)
-        logger.info(f"✅ Connected to spreadsheet: {GOOGLE_SHEET_ID}")
         
-        current_date = get_uae_time()
-        sheet_name = f"Gold_Trades_{current_date.strftime('%Y_%m')}"
-        logger.info(f"🔄 Target sheet: {sheet_name}")
-        
-        try:
-            worksheet = spreadsheet.worksheet(sheet_name)
-            logger.info(f"✅ Found existing sheet: {sheet_name}")
-        except:
-            logger.info(f"🔄 Creating new sheet: {sheet_name}")
-            worksheet = spreadsheet.add_worksheet(title=sheet_name, rows=1000, cols=21)
-            
-            # FIXED v4.9.3 HEADERS - EXACT 21 columns matching data
-            headers = [
-                'Date', 'Time', 'Dealer', 'Operation', 'Customer', 'Gold Type', 
-                'Volume', 'Pure Gold', 'Price USD', 'Total AED', 'Final Rate', 
-                'Purity', 'Rate Type', 'P/D Amount', 'Session ID', 'Approval Status', 
-                'Approved By', 'Notes', 'Rate Fixed', 'Fixed Time', 'Fixed By'
-            ]
-            worksheet.append_row(headers)
-            
-            # Apply header formatting
-            header_format = {
-                "backgroundColor": {"red": 0.2, "green": 0.2, "blue": 0.8},
-                "textFormat": {"bold": True, "foregroundColor": {"red": 1.0, "green": 1.0, "blue": 1.0}},
-                "horizontalAlignment": "CENTER"
-            }
-            worksheet.format("A1:U1", header_format)
-            
-            logger.info(f"✅ Created sheet with FIXED v4.9.3 headers: {sheet_name}")
+        # Bind hot session attributes once
+        rate_type = session.rate_type
+        volume_kg = session.volume_kg
         
         # Calculate trade totals
-        logger.info(f"🔄 Calculating trade totals for rate type: {session.rate_type}")
-        
-        if session.rate_type == "override":
-            calc_results = calculate_trade_totals_with_override(
-                session.volume_kg,
-                session.gold_purity['value'],
-                session.final_rate_per_oz,
-                "override"
-            )
-            base_rate_usd = session.final_rate_per_oz
-            rate_description = f"OVERRIDE: ${session.final_rate_per_oz:,.2f}/oz (FINAL)"
-            pd_amount_display = "N/A (Override)"
-        elif session.rate_type == "unfix":
-            base_rate_usd = market_data['gold_usd_oz']
-            
-            if hasattr(session, 'pd_type') and hasattr(session, 'pd_amount') and session.pd_type and session.pd_amount is not None:
-                if session.pd_type == "premium":
-                    preview_rate = base_rate_usd + session.pd_amount
-                    pd_amount_display = f"+${session.pd_amount:.2f} (UNFIX)"
-                else:
-                    preview_rate = base_rate_usd - session.pd_amount
-                    pd_amount_display = f"-${session.pd_amount:.2f} (UNFIX)"
-                
-                calc_results = calculate_trade_totals_with_override(
-                    session.volume_kg,
-                    session.gold_purity['value'],
-                    preview_rate,
-                    "unfix"
-                )
-                rate_description = f"UNFIX: Market ${base_rate_usd:.2f} {pd_amount_display}"
-            else:
-                calc_results = calculate_trade_totals_with_override(
-                    session.volume_kg,
-                    session.gold_purity['value'],
-                    base_rate_usd,
-                    "unfix"
-                )
-                rate_description = f"UNFIX: Rate to be fixed later (Market ref: ${base_rate_usd:,.2f}/oz)"
-                pd_amount_display = "N/A (Pure Unfix)"
-                
+        logger.info("🔄 Calculating trade totals for rate type: %s", rate_type)
+        
+        # Rate-type resolver picks the final rate and labels; the totals go through the session's
+        # calc cache, which the approval views then reuse for the same numbers
+        resolve_rate = SAVE_RATE_RESOLVERS.get(rate_type, _resolve_pd_save_rate)
+        final_rate, rate_source, rate_description, pd_amount_display = resolve_rate(
+            session, market_data['gold_usd_oz']
+        )
+        if rate_type == "unfix":
             session.rate_fixed_status = "Unfixed"
-            session.unfix_time = current_date.strftime('%Y-%m-%d %H:%M:%S')
-        else:
-            if session.rate_type == "market":
-                base_rate_usd = market_data['gold_usd_oz']
-            else:  # custom
-                base_rate_usd = getattr(session, 'custom_rate', session.rate_per_oz)
-            
-            calc_results = calculate_trade_totals(
-                session.volume_kg,
-                session.gold_purity['value'],
-                base_rate_usd,
-                session.pd_type,
-                session.pd_amount
-            )
-            
-            pd_sign = "+" if session.pd_type == "premium" else "-"
-            rate_description = f"{session.rate_type.upper()}: ${base_rate_usd:,.2f} {pd_sign} ${session.pd_amount}/oz"
-            pd_amount_display = f"{pd_sign}${session.pd_amount:.2f}"
+            session.unfix_time = timestamp
         
-        logger.info(f"✅ Trade calculations completed")
+        calc_results = session.trade_totals(final_rate, rate_source)
+        logger.info("✅ Trade calculations completed")
         
         # Extract calculated values
-        pure_gold_kg = calc_results['pure_gold_kg']
-        total_price_usd = calc_results['total_price_usd']
-        total_price_aed = calc_results['total_price_aed']
-        final_rate_usd = calc_results.get('final_rate_usd_per_oz', 0)
+        pure_gold_kg = calc_results.pure_gold_kg
+        total_price_usd = calc_results.total_price_usd
+        total_price_aed = calc_results.total_price_aed
+        final_rate_usd = calc_results.final_rate_usd_per_oz
         
         # Build gold type description
         gold_type_desc = session.gold_type['name']
-        if hasattr(session, 'quantity') and session.quantity:
+        if session.quantity:
             gold_type_desc += f" (qty: {session.quantity})"
         
         # Get approval info
-        approval_status = getattr(session, 'approval_status', 'pending')
-        approved_by = getattr(session, 'approved_by', [])
-        comments = getattr(session, 'comments', [])
+        approval_status = session.approval_status
+        approved_by = session.approved_by
+        comments = session.comments
         
-        logger.info(f"🔄 Approval status: {approval_status}")
+        logger.info("🔄 Approval status: %s", approval_status)
         
         # Build notes
         notes_parts = [f"v4.9.3 UAE: {rate_description}"]
@@ -1232,30 +1684,30 @@ def save_trade_to_sheets(session):
         notes_text = " | ".join(notes_parts)
         
         # Rate fixed status
-        rate_fixed = "Yes" if session.rate_type != "unfix" else "No"
+        rate_fixed = "Yes" if rate_type != "unfix" else "No"
         
         # Rate fixing info
-        fixed_time = getattr(session, 'fixed_time', '')
-        fixed_by = getattr(session, 'fixed_by', '')
+        fixed_time = session.fixed_time
+        fixed_by = session.fixed_by
         
         # Set price for notifications
         session.price = total_price_usd
         
         # FIXED: Row data EXACTLY matching the 21 headers in order
         row_data = [
-            current_date.strftime('%Y-%m-%d'),                              # Date
-            current_date.strftime('%H:%M:%S') + ' UAE',                     # Time
+            timestamp[:10],                                                  # Date
+            timestamp[11:] + ' UAE',                                         # Time
             session.dealer['name'],                                          # Dealer
             session.operation.upper(),                                       # Operation
             session.customer,                                                # Customer
             gold_type_desc,                                                  # Gold Type
-            f"{session.volume_kg:.3f} KG ({session.volume_kg * 1000:,.0f}g)",  # Volume (combined)
-            f"{pure_gold_kg:.3f} KG ({pure_gold_kg * 1000:,.0f}g)",           # Pure Gold (combined)
+            SHEET_WEIGHT_FORMAT(volume_kg, volume_kg * 1000),                # Volume (combined)
+            SHEET_WEIGHT_FORMAT(pure_gold_kg, pure_gold_kg * 1000),          # Pure Gold (combined)
             f"${total_price_usd:,.2f}",                                      # Price USD
             f"AED {total_price_aed:,.2f}",                                   # Total AED
             f"${final_rate_usd:,.2f}",                                       # Final Rate
             session.gold_purity['name'],                                     # Purity
-            "UNFIX" if session.rate_type == "unfix" else session.rate_type.upper(),  # Rate Type
+            "UNFIX" if rate_type == "unfix" else rate_type.upper(),          # Rate Type
             pd_amount_display,                                               # P/D Amount
             session.session_id,                                              # Session ID
             approval_status.upper(),                                         # Approval Status
@@ -1268,44 +1720,39 @@ def save_trade_to_sheets(session):
         
         # Ensure exactly 21 columns
         if len(row_data) != 21:
-            logger.error(f"❌ Row data length mismatch: {len(row_data)} vs 21 expected")
+            logger.error("❌ Row data length mismatch: %s vs 21 expected", len(row_data))
             return False, f"Data structure error: {len(row_data)} columns instead of 21"
         
-        logger.info(f"🔄 Appending row data to sheet (21 columns)...")
+        logger.info("🔄 Appending row data to sheet (21 columns)...")
         
         # Add row and get position
-        worksheet.append_row(row_data)
-        row_count = len(worksheet.get_all_values())
+        response = worksheet.append_row(row_data)
+        try:
+            row_count = _appended_row_number(response)
+        except (KeyError, TypeError, ValueError):
+            row_count = len(worksheet.col_values(1))
         
-        logger.info(f"✅ Row added at position: {row_count}")
+        logger.info("✅ Row added at position: %s", row_count)
         
         # Apply color coding to approval columns only
         try:
-            if approval_status == "pending":
-                color_format = {"backgroundColor": {"red": 1.0, "green": 0.8, "blue": 0.8}}
-            elif approval_status == "abhay_approved":
-                color_format = {"backgroundColor": {"red": 1.0, "green": 1.0, "blue": 0.7}}
-            elif approval_status == "mushtaq_approved":
-                color_format = {"backgroundColor": {"red": 1.0, "green": 0.9, "blue": 0.6}}
-            elif approval_status == "final_approved":
-                color_format = {"backgroundColor": {"red": 0.8, "green": 1.0, "blue": 0.8}}
-            elif approval_status == "rejected":
-                color_format = {"backgroundColor": {"red": 0.9, "green": 0.6, "blue": 0.6}}
-            else:
-                color_format = {"backgroundColor": {"red": 1.0, "green": 1.0, "blue": 1.0}}
-            
-            # Apply color to approval columns only (P:R = Approval Status, Approved By, Notes)
-            worksheet.format(f"P{row_count}:R{row_count}", color_format)
-            logger.info(f"✅ Applied {approval_status} color formatting")
-            
-            # Special formatting for unfixed trades
+            # Color the approval columns (P:R = Approval Status, Approved By, Notes) and,
+            # for unfixed trades, the Rate Fixed column - one batchUpdate for the row
+            # Integer grid ranges - no per-row A1 strings to build and parse
+            row_index = row_count - 1
+            row_formats = [row_format_request(
+                worksheet.id, row_index, TRADE_APPROVAL_STATUS_COL, TRADE_NOTES_COL,
+                APPROVAL_STATUS_FORMATS.get(approval_status, DEFAULT_STATUS_FORMAT)
+            )]
             if rate_fixed == "No":
-                unfix_format = {"backgroundColor": {"red": 1.0, "green": 0.95, "blue": 0.8}}
-                worksheet.format(f"S{row_count}", unfix_format)  # Rate Fixed column
-                logger.info(f"✅ Applied unfixed rate formatting")
+                row_formats.append(row_format_request(
+                    worksheet.id, row_index, TRADE_RATE_FIXED_COL, TRADE_RATE_FIXED_COL, UNFIXED_RATE_FORMAT
+                ))
+            worksheet.spreadsheet.batch_update({"requests": row_formats})
+            logger.info("✅ Applied %s color formatting", approval_status)
             
         except Exception as e:
-            logger.warning(f"⚠️ Color formatting failed: {e}")
+            logger.warning("⚠️ Color formatting failed: %s", e)
         
         # Add to unfixed trades if needed
         if session.rate_type == "unfix":
@@ -1314,54 +1761,126 @@ def save_trade_to_sheets(session):
                 'row_number': row_count,
                 'session': session
             }
-            logger.info(f"📋 Added to unfixed_trades: {session.session_id}")
+            invalidate_unfixed_cache()
+            logger.info("📋 Added to unfixed_trades: %s", session.session_id)
         
-        logger.info(f"✅ Trade saved to sheets successfully: {session.session_id}")
+        logger.info("✅ Trade saved to sheets successfully: %s", session.session_id)
         return True, session.session_id
         
+    except sheets_api_error() as e:
+        reset_sheets_cache()
+        logger.error("❌ Sheets API error during save: %s", e)
+        return False, str(e)
     except Exception as e:
-        logger.error(f"❌ Sheets save failed: {e}")
+        logger.error("❌ Sheets save failed: %s", e)
         return False, str(e)
 
 # ============================================================================
 # BOT SETUP AND INITIALIZATION
 # ============================================================================
 
-bot = telebot.TeleBot(TELEGRAM_BOT_TOKEN)
+bot = telebot.TeleBot(TELEGRAM_BOT_TOKEN, threaded=True, num_threads=BOT_WORKER_THREADS)
 
-@bot.message_handler(commands=['start'])
-def start_command(message):
-    """Start command - Enhanced v4.9.3"""
+class ChatEditLimiter:
+    """Per-chat token bucket for message edits (Telegram soft-limits ~1 edit/s per chat).
+
+    Also remembers the last payload sent per message so identical edits are skipped,
+    and a sequence per message so an edit superseded while waiting is dropped.
+    """
+    MAX_TRACKED = 1000
+    
+    def __init__(self, rate=1.0, burst=3):
+        self.rate = rate
+        self.burst = burst
+        self._lock = threading.Lock()
+        self._buckets = {}   # chat_id -> (tokens, last_refill)
+        self._latest = {}    # (chat_id, message_id) -> newest reserved seq
+        self._sent = {}      # (chat_id, message_id) -> payload hash of last sent edit
+        self._seq = 0
+    
+    def _remember(self, table, key, value):
+        table.pop(key, None)
+        table[key] = value
+        if len(table) > self.MAX_TRACKED:
+            table.pop(next(iter(table)))
+    
+    def is_duplicate(self, key, payload):
+        with self._lock:
+            return self._sent.get(key) == payload
+    
+    def reserve(self, chat_id, key):
+        """Take a send slot -> (seq, seconds to wait)"""
+        with self._lock:
+            now = time.monotonic()
+            tokens, last = self._buckets.get(chat_id, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - last) * self.rate) - 1
+            self._remember(self._buckets, chat_id, (tokens, now))
+            self._seq += 1
+            self._remember(self._latest, key, self._seq)
+            return self._seq, (-tokens / self.rate if tokens < 0 else 0)
+    
+    def is_latest(self, key, seq):
+        with self._lock:
+            return self._latest.get(key) == seq
+    
+    def mark_sent(self, key, payload):
+        with self._lock:
+            self._remember(self._sent, key, payload)
+
+edit_limiter = ChatEditLimiter()
+
+def edit_message_text(text, chat_id, message_id, **kwargs):
+    """bot.edit_message_text behind the per-chat limiter - skips no-op and superseded edits"""
+    key = (chat_id, message_id)
+    markup = kwargs.get('reply_markup')
+    payload = hash((text, markup.to_json() if markup is not None else None, kwargs.get('parse_mode')))
+    if edit_limiter.is_duplicate(key, payload):
+        return None
+    
+    seq, delay = edit_limiter.reserve(chat_id, key)
+    if delay:
+        time.sleep(delay)
+    if not edit_limiter.is_latest(key, seq):
+        return None
+    
     try:
-        user_id = message.from_user.id
-        
-        if user_id in user_sessions:
-            del user_sessions[user_id]
-        
-        fetch_gold_rate()
-        
-        markup = types.InlineKeyboardMarkup()
-        level_emojis = {"admin": "👑", "senior": "⭐", "standard": "🔹", "junior": "🔸", "approver": "✅", "final_approver": "🔥"}
-        
-        for dealer_id, dealer in DEALERS.items():
-            if dealer.get('active', True):
-                emoji = level_emojis.get(dealer['level'], "👤")
-                role_desc = dealer.get('role', dealer['level'].title())
-                markup.add(types.InlineKeyboardButton(
-                    f"{emoji} {dealer['name']} ({role_desc})",
-                    callback_data=f"login_{dealer_id}"
-                ))
-        
-        markup.add(types.InlineKeyboardButton("💰 Live Gold Rate", callback_data="show_rate"))
-        
-        welcome_text = f"""🥇 GOLD TRADING BOT v4.9.3 - FIXED VERSION! 🔧
+        result = bot.edit_message_text(text, chat_id, message_id, **kwargs)
+    except telebot.apihelper.ApiTelegramException as e:
+        # Same content already on screen (e.g. first refresh after a restart) - nothing to do
+        if 'message is not modified' not in str(e):
+            raise
+        result = None
+    edit_limiter.mark_sent(key, payload)
+    return result
+
+# Progress text ("Searching...") is only worth an edit when the work is noticeably slow
+PROGRESS_EDIT_DELAY = 0.4
+
+def _progress_edit(text, chat_id, message_id):
+    try:
+        edit_message_text(text, chat_id, message_id)
+    except Exception as e:
+        logger.warning("⚠️ Progress edit failed: %s", e)
+
+def run_with_progress(text, chat_id, message_id, func, *args):
+    """Run func(*args), showing `text` on the message only if it takes longer than PROGRESS_EDIT_DELAY"""
+    timer = threading.Timer(PROGRESS_EDIT_DELAY, _progress_edit, (text, chat_id, message_id))
+    timer.daemon = True
+    timer.start()
+    try:
+        return func(*args)
+    finally:
+        timer.cancel()
+        timer.join()  # a progress edit already in flight lands before the caller's result edit
+
+WELCOME_TEMPLATE = """🥇 GOLD TRADING BOT v4.9.3 - FIXED VERSION! 🔧
 🚀 FIXED Sheet Formatting + Enhanced Feedback
 
 📊 SYSTEM STATUS:
-💰 Current Rate: {format_money(market_data['gold_usd_oz'])} USD/oz
-💱 AED Rate: {format_money_aed(market_data['gold_usd_oz'])}/oz
-📈 Trend: {market_data['trend'].title()}
-🇦🇪 UAE Time: {market_data['last_update']}
+💰 Current Rate: {rate_usd} USD/oz
+💱 AED Rate: {rate_aed}/oz
+📈 Trend: {trend}
+🇦🇪 UAE Time: {last_update}
 🔄 Updates: Every 2 minutes
 ☁️ Cloud: Railway Platform (Always On)
 
@@ -1383,17 +1902,159 @@ def start_command(message):
 • Professional error handling
 
 🔒 SELECT DEALER TO LOGIN:"""
+
+@functools.lru_cache(maxsize=8)
+def render_welcome_text(gold_usd_oz, trend, last_update_epoch):
+    """/start welcome text - only changes when the rate snapshot does"""
+    rate_usd, rate_aed = market_rate_text(gold_usd_oz)
+    return WELCOME_TEMPLATE.format(
+        rate_usd=rate_usd,
+        rate_aed=rate_aed,
+        trend=trend.title(),
+        last_update=format_update_epoch(last_update_epoch)
+    )
+
+@bot.message_handler(commands=['start'])
+def start_command(message):
+    """Start command - Enhanced v4.9.3"""
+    try:
+        user_id = message.from_user.id
+        
+        # Serialized with this user's callbacks so an in-flight handler never sees its session vanish mid-update
+        with user_lock(user_id):
+            user_sessions.pop(user_id, None)
+        
+        markup = DEALER_LOGIN_MARKUP
+        
+        market = market_data
+        welcome_text = render_welcome_text(market['gold_usd_oz'], market['trend'], market['last_update_epoch'])
         
         bot.send_message(message.chat.id, welcome_text, reply_markup=markup)
-        logger.info(f"👤 User {user_id} started FIXED bot v4.9.3")
+        logger.info("👤 User %s started FIXED bot v4.9.3", user_id)
         
     except Exception as e:
-        logger.error(f"❌ Start error: {e}")
+        logger.error("❌ Start error: %s", e)
         try:
             bot.send_message(message.chat.id, "❌ Error occurred. Please try again.")
         except:
             pass
 
+# ============================================================================
+# STATIC MARKUPS - built once, shared across callbacks (never mutate)
+# ============================================================================
+
+def build_markup(*buttons):
+    """Build a one-button-per-row inline keyboard from (text, callback_data) pairs"""
+    return types.InlineKeyboardMarkup(keyboard=[
+        [types.InlineKeyboardButton(text, callback_data=callback_data)]
+        for text, callback_data in buttons
+    ])
+
+def build_grid_markup(buttons, per_row, *footer):
+    """Inline keyboard with (text, callback_data) buttons per_row wide, then one-per-row footer buttons"""
+    keyboard = [
+        [types.InlineKeyboardButton(text, callback_data=callback_data) for text, callback_data in buttons[i:i + per_row]]
+        for i in range(0, len(buttons), per_row)
+    ]
+    keyboard.extend([types.InlineKeyboardButton(text, callback_data=callback_data)] for text, callback_data in footer)
+    return types.InlineKeyboardMarkup(keyboard=keyboard)
+
+LOGIN_BACK_MARKUP = build_markup(("🔙 Back", "start"))
+UNKNOWN_CALLBACK_MARKUP = build_markup(("🔙 Back", "dashboard"))
+BACK_TO_APPROVAL_MARKUP = build_markup(("🔙 Approval Dashboard", "approval_dashboard"))
+APPROVAL_RESULT_MARKUP = build_markup(
+    ("✅ Approval Dashboard", "approval_dashboard"),
+    ("🏠 Dashboard", "dashboard")
+)
+DELETE_RESULT_MARKUP = build_markup(
+    ("✅ Approval Dashboard", "approval_dashboard"),
+    ("🔙 Dashboard", "dashboard")
+)
+FIX_RATE_TYPE_MARKUP = build_markup(
+    ("📊 Market Rate", "fixrate_market"),
+    ("⚡ Custom Rate", "fixrate_custom"),
+    ("🔙 Back", "fix_unfixed_deals")
+)
+FIX_CUSTOM_PD_MARKUP = build_markup(
+    ("⬆️ PREMIUM", "fixpd_premium"),
+    ("⬇️ DISCOUNT", "fixpd_discount"),
+    ("🔙 Back", "fixrate_custom")
+)
+FIX_RESULT_MARKUP = build_markup(
+    ("🔧 Fix More Deals", "fix_unfixed_deals"),
+    ("🔙 Dashboard", "dashboard")
+)
+
+# Preset (text, callback_data) pairs - formatted once, reused by every fix-rate keyboard
+CUSTOM_RATE_BUTTONS = tuple((f"${rate:,.2f}", f"fixcustom_{rate}") for rate in CUSTOM_RATE_PRESETS)
+PREMIUM_AMOUNT_BUTTONS = tuple((f"${amount}", f"fixamount_{amount}") for amount in PREMIUM_AMOUNTS)
+DISCOUNT_AMOUNT_BUTTONS = tuple((f"${amount}", f"fixamount_{amount}") for amount in DISCOUNT_AMOUNTS)
+
+@functools.lru_cache(maxsize=8)
+def fix_pd_amount_markup(pd_type, rate_type):
+    """Premium/discount amount grid for the fix-rate flow (cached, never mutate)"""
+    return build_grid_markup(
+        PREMIUM_AMOUNT_BUTTONS if pd_type == "premium" else DISCOUNT_AMOUNT_BUTTONS,
+        4,
+        ("🔙 Back", f"fixrate_{rate_type}")
+    )
+
+DEALER_LEVEL_EMOJIS = {"admin": "👑", "senior": "⭐", "standard": "🔹", "junior": "🔸", "approver": "✅", "final_approver": "🔥"}
+
+DEALER_LOGIN_MARKUP = build_markup(
+    *(
+        (f"{DEALER_LEVEL_EMOJIS.get(dealer['level'], '👤')} {dealer['name']} ({dealer.get('role', dealer['level'].title())})",
+         f"login_{dealer_id}")
+        for dealer_id, dealer in DEALERS.items() if dealer.get('active', True)
+    ),
+    ("💰 Live Gold Rate", "show_rate")
+)
+
+class DealerAccess(NamedTuple):
+    """Capabilities derived from a dealer's permission list"""
+    can_trade: bool
+    can_approve: bool
+    is_admin: bool
+    can_fix_rates: bool
+
+@functools.lru_cache(maxsize=16)
+def dealer_access(permissions):
+    """Capabilities for a frozenset of permissions - only a handful of distinct sets exist"""
+    return DealerAccess(
+        can_trade=not permissions.isdisjoint(('buy', 'sell')),
+        can_approve=not permissions.isdisjoint(('approve', 'reject', 'comment', 'final_approve')),
+        is_admin='admin' in permissions,
+        can_fix_rates=not permissions.isdisjoint(('buy', 'sell', 'admin'))
+    )
+
+@functools.lru_cache(maxsize=32)
+def dashboard_markup(can_trade, can_approve, is_admin, unfixed_count, pending_count):
+    """Dashboard keyboard for a permission set and the counts shown on its buttons (cached, never mutate)"""
+    buttons = []
+    
+    # Regular trading for dealers
+    if can_trade:
+        buttons.append(("📊 NEW TRADE", "new_trade"))
+        
+        # Fix unfixed deals option
+        if unfixed_count > 0:
+            buttons.append((f"🔧 Fix Unfixed Deals ({unfixed_count})", "fix_unfixed_deals"))
+    
+    # FIXED: Better approval dashboard for approvers
+    if can_approve:
+        buttons.append((f"✅ Approval Dashboard ({pending_count} pending)", "approval_dashboard"))
+    
+    buttons.append(("💰 Live Rate", "show_rate"))
+    buttons.append(("🔄 Refresh Rate", "force_refresh_rate"))
+    
+    # Admin options
+    if is_admin:
+        buttons.append(("🧪 Test Save Function", "test_save"))
+    
+    buttons.append(("🔧 System Status", "system_status"))
+    buttons.append(("🔙 Logout", "start"))
+    return build_markup(*buttons)
+
 # ============================================================================
 # NAVIGATION HELPER FUNCTIONS
 # ============================================================================
@@ -1414,7 +2075,7 @@ def get_back_button(current_step, session):
         elif current_step == "custom_volume":
             return types.InlineKeyboardButton("🔙 Volume", callback_data="step_volume")
         elif current_step == "purity":
-            if hasattr(session, 'quantity') and session.quantity:
+            if session.quantity:
                 return types.InlineKeyboardButton("🔙 Quantity", callback_data="step_quantity")
             else:
                 return types.InlineKeyboardButton("🔙 Volume", callback_data="step_volume")
@@ -1427,7 +2088,7 @@ def get_back_button(current_step, session):
         elif current_step == "custom_rate":
             return types.InlineKeyboardButton("🔙 Rate Choice", callback_data="step_rate_choice")
         elif current_step == "pd_type":
-            if hasattr(session, 'rate_type') and session.rate_type == "custom":
+            if session.rate_type == "custom":
                 return types.InlineKeyboardButton("🔙 Custom Rate", callback_data="step_custom_rate")
             else:
                 return types.InlineKeyboardButton("🔙 Rate Choice", callback_data="step_rate_choice")
@@ -1440,115 +2101,66 @@ def get_back_button(current_step, session):
         else:
             return types.InlineKeyboardButton("🔙 Dashboard", callback_data="dashboard")
     except Exception as e:
-        logger.error(f"❌ Back button error: {e}")
+        logger.error("❌ Back button error: %s", e)
         return types.InlineKeyboardButton("🔙 Dashboard", callback_data="dashboard")
 
 # ============================================================================
 # CALLBACK HANDLER - SIMPLIFIED AND FIXED
 # ============================================================================
 
+# Striped per-user locks - fixed memory, one user always maps to the same lock.
+# Reentrant: the 'start' callback runs start_command, which takes a lock itself.
+_USER_LOCK_STRIPES = tuple(threading.RLock() for _ in range(64))
+
+def user_lock(user_id):
+    """Lock serializing one user's callbacks"""
+    return _USER_LOCK_STRIPES[hash(user_id) % len(_USER_LOCK_STRIPES)]
+
+_callback_ack_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="callback-ack")
+
+def _ack_callback(callback_id, text=None):
+    """Answer a callback query, ignoring expired/duplicate acks"""
+    try:
+        bot.answer_callback_query(callback_id, text)
+    except Exception as e:
+        logger.warning("⚠️ Callback ack failed: %s", e)
+
 @bot.callback_query_handler(func=lambda call: True)
 def handle_callbacks(call):
     """FIXED: Handle all callbacks with better navigation for approvers"""
+    data = call.data
+    handler, args = dispatch_callback(data)
+    
+    if handler is None:
+        # Unhandled data - the ack toast is the whole reply, no message edit round-trip
+        logger.warning("⚠️ Unhandled callback: %s", data)
+        if data.partition('_')[0] in KNOWN_CALLBACK_PREFIXES:
+            unhandled_text = "🚧 Feature under development"
+        else:
+            unhandled_text = "❌ Unknown action - please return to the dashboard"
+        _callback_ack_pool.submit(_ack_callback, call.id, unhandled_text)
+        return
+    
+    # Ack first, off-thread - stops the button spinner without waiting for the edit round-trip
+    _callback_ack_pool.submit(_ack_callback, call.id)
     try:
         user_id = call.from_user.id
-        data = call.data
-        
-        logger.info(f"📱 Callback: {user_id} -> {data}")
-        
-        # FIXED: Enhanced callback mapping with better approver navigation
-        if data == 'start':
-            start_command(call.message)
-        elif data == 'dashboard':
-            handle_dashboard(call)
-        elif data == 'show_rate':
-            handle_show_rate(call)
-        elif data == 'force_refresh_rate':
-            handle_force_refresh_rate(call)
-        elif data == 'new_trade':
-            handle_new_trade(call)
-        elif data == 'confirm_trade':
-            handle_confirm_trade(call)
-        elif data == 'cancel_trade':
-            handle_cancel_trade(call)
-        elif data == 'approval_dashboard':
-            handle_approval_dashboard(call)
-        elif data == 'fix_unfixed_deals':
-            handle_fix_unfixed_deals(call)
-        elif data == 'system_status':
-            handle_system_status(call)
-        elif data == 'test_save':
-            handle_test_save(call)
-        elif data.startswith('login_'):
-            handle_login(call)
-        elif data.startswith('operation_'):
-            handle_operation(call)
-        elif data.startswith('goldtype_'):
-            handle_gold_type(call)
-        elif data.startswith('quantity_'):
-            handle_quantity(call)
-        elif data.startswith('volume_'):
-            handle_volume(call)
-        elif data.startswith('purity_'):
-            handle_purity(call)
-        elif data.startswith('customer_'):
-            handle_customer(call)
-        elif data.startswith('comm_'):
-            handle_communication_type(call)
-        elif data.startswith('rate_'):
-            handle_rate_choice(call)
-        elif data.startswith('custom_rate_'):
-            handle_custom_rate_selection(call)
-        elif data.startswith('pd_'):
-            handle_pd_type(call)
-        elif data.startswith('premium_') or data.startswith('discount_'):
-            handle_pd_amount(call)
-        elif data.startswith('fix_rate_'):
-            handle_fix_rate(call)
-        elif data.startswith('fixrate_'):
-            handle_fixrate_choice(call)
-        elif data.startswith('fixcustom_'):
-            handle_fixcustom_choice(call)
-        elif data.startswith('fixpd_'):
-            handle_fixrate_pd(call)
-        elif data.startswith('fixamount_'):
-            handle_fix_pd_amount(call)
-        elif data.startswith('approve_'):
-            handle_approve_trade(call)
-        elif data.startswith('reject_'):
-            handle_reject_trade(call)
-        elif data.startswith('comment_'):
-            handle_comment_trade(call)
-        elif data.startswith('view_trade_'):
-            handle_view_trade(call)
-        elif data.startswith('delete_trade_'):
-            handle_delete_trade(call)
-        elif data == 'custom_quantity_input':
-            handle_custom_quantity_input(call)
-        elif data == 'custom_volume_input':
-            handle_custom_volume_input(call)
-        elif data == 'custom_pd_input':
-            handle_custom_pd_input(call)
-        else:
-            logger.warning(f"⚠️ Unhandled callback: {data}")
-            try:
-                bot.edit_message_text(
-                    f"🚧 Feature under development: {data}",
-                    call.message.chat.id,
-                    call.message.message_id,
-                    reply_markup=types.InlineKeyboardMarkup().add(
-                        types.InlineKeyboardButton("🔙 Back", callback_data="dashboard")
-                    )
-                )
-            except:
-                pass
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("📱 Callback: %s -> %s", user_id, data)
         
-        bot.answer_callback_query(call.id)
+        # Same user's taps run one at a time, in order; other users proceed in parallel
+        with user_lock(user_id):
+            handler(call, *args)
         
     except Exception as e:
-        logger.error(f"❌ Critical callback error for {call.data}: {e}")
+        logger.exception("❌ Handler %s error for %s", handler.__name__, data)
         try:
-            bot.answer_callback_query(call.id, f"Error: {str(e)[:50]}")
+            edit_message_text(
+                f"❌ Error: {str(e)[:50]}",
+                call.message.chat.id,
+                call.message.message_id,
+                reply_markup=UNKNOWN_CALLBACK_MARKUP
+            )
         except:
             pass
 
@@ -1556,34 +2168,13 @@ def handle_callbacks(call):
 # CORE HANDLER FUNCTIONS
 # ============================================================================
 
-def handle_login(call):
-    """Handle login"""
-    try:
-        dealer_id = call.data.replace("login_", "")
-        dealer = DEALERS.get(dealer_id)
-        
-        if not dealer:
-            bot.edit_message_text("❌ Dealer not found", call.message.chat.id, call.message.message_id)
-            return
-        
-        user_id = call.from_user.id
-        register_telegram_id(dealer_id, user_id)
-        
-        user_sessions[user_id] = {
-            "step": "awaiting_pin",
-            "temp_dealer_id": dealer_id,
-            "temp_dealer": dealer,
-            "login_attempts": 0
-        }
-        
-        markup = types.InlineKeyboardMarkup()
-        markup.add(types.InlineKeyboardButton("🔙 Back", callback_data="start"))
-        
-        role_info = dealer.get('role', dealer['level'].title())
-        permissions_desc = ', '.join(dealer.get('permissions', ['N/A'])).upper()
-        
-        bot.edit_message_text(
-            f"""🔒 DEALER AUTHENTICATION
+@functools.lru_cache(maxsize=None)
+def dealer_login_text(dealer_id):
+    """PIN prompt for a dealer - DEALERS names/roles/permissions are static, so format once"""
+    dealer = DEALERS[dealer_id]
+    role_info = dealer.get('role', dealer['level'].title())
+    permissions_desc = ', '.join(dealer.get('permissions', ['N/A'])).upper()
+    return f"""🔒 DEALER AUTHENTICATION
 
 Selected: {dealer['name']} ({role_info})
 Permissions: {permissions_desc}
@@ -1593,73 +2184,71 @@ Permissions: {permissions_desc}
 
 📲 Telegram notifications are now ACTIVE for your role!
 
-Type the PIN now:""",
-            call.message.chat.id,
-            call.message.message_id,
-            reply_markup=markup
-        )
-    except Exception as e:
-        logger.error(f"Login error: {e}")
+Type the PIN now:"""
+
+def handle_login(call, dealer_id):
+    """Handle login"""
+    dealer = DEALERS.get(dealer_id)
+    
+    if not dealer:
+        edit_message_text("❌ Dealer not found", call.message.chat.id, call.message.message_id)
+        return
+    
+    user_id = call.from_user.id
+    register_telegram_id(dealer_id, user_id)
+    
+    user_sessions[user_id] = {
+        "step": "awaiting_pin",
+        "temp_dealer_id": dealer_id,
+        "temp_dealer": dealer,
+        "login_attempts": 0
+    }
+    
+    markup = LOGIN_BACK_MARKUP
+    
+    edit_message_text(
+        dealer_login_text(dealer_id),
+        call.message.chat.id,
+        call.message.message_id,
+        reply_markup=markup
+    )
 
 def handle_dashboard(call):
     """FIXED: Dashboard with better approver navigation"""
-    try:
-        fetch_gold_rate()
-        
-        user_id = call.from_user.id
-        session = user_sessions.get(user_id, {})
-        dealer = session.get("dealer")
-        
-        if not dealer:
-            bot.edit_message_text("❌ Please login again", call.message.chat.id, call.message.message_id)
-            return
-        
-        permissions = dealer.get('permissions', ['buy'])
-        
-        markup = types.InlineKeyboardMarkup()
-        
-        # Regular trading for dealers
-        if any(p in permissions for p in ['buy', 'sell']):
-            markup.add(types.InlineKeyboardButton("📊 NEW TRADE", callback_data="new_trade"))
-            
-            # Fix unfixed deals option
-            unfixed_list = get_unfixed_trades_from_sheets()
-            unfixed_count = len(unfixed_list)
-            if unfixed_count > 0:
-                markup.add(types.InlineKeyboardButton(f"🔧 Fix Unfixed Deals ({unfixed_count})", callback_data="fix_unfixed_deals"))
-        
-        # FIXED: Better approval dashboard for approvers
-        if any(p in permissions for p in ['approve', 'reject', 'comment', 'final_approve']):
-            pending_count = len(get_pending_trades())
-            markup.add(types.InlineKeyboardButton(f"✅ Approval Dashboard ({pending_count} pending)", callback_data="approval_dashboard"))
-        
-        markup.add(types.InlineKeyboardButton("💰 Live Rate", callback_data="show_rate"))
-        markup.add(types.InlineKeyboardButton("🔄 Refresh Rate", callback_data="force_refresh_rate"))
-        
-        # Admin options
-        if 'admin' in permissions:
-            markup.add(types.InlineKeyboardButton("🧪 Test Save Function", callback_data="test_save"))
-        
-        markup.add(types.InlineKeyboardButton("🔧 System Status", callback_data="system_status"))
-        markup.add(types.InlineKeyboardButton("🔙 Logout", callback_data="start"))
-        
-        role_info = dealer.get('role', dealer['level'].title())
-        unfixed_display = f"\n• Unfixed Trades: {len(get_unfixed_trades_from_sheets())}" if len(get_unfixed_trades_from_sheets()) > 0 else ""
-        
-        dashboard_text = f"""✅ DEALER DASHBOARD v4.9.3 - FIXED! 🔧
+    user_id = call.from_user.id
+    session = user_sessions.get(user_id, {})
+    dealer = session.get("dealer")
+    
+    if not dealer:
+        edit_message_text("❌ Please login again", call.message.chat.id, call.message.message_id)
+        return
+    
+    permissions = dealer.get('permissions', ['buy'])
+    access = dealer_access(frozenset(permissions))
+    unfixed_count = len(get_unfixed_trades_from_sheets())
+    pending_count = len(get_pending_trades())
+    
+    markup = dashboard_markup(access.can_trade, access.can_approve, access.is_admin, unfixed_count, pending_count)
+    
+    role_info = dealer.get('role', dealer['level'].title())
+    unfixed_display = f"\n• Unfixed Trades: {unfixed_count}" if unfixed_count > 0 else ""
+    
+    market = market_data
+    rate_usd, rate_aed = market_rate_text(market['gold_usd_oz'])
+    dashboard_text = f"""✅ DEALER DASHBOARD v4.9.3 - FIXED! 🔧
 
 👤 Welcome {dealer['name'].upper()}!
 🔒 Role: {role_info}
 🎯 Permissions: {', '.join(permissions).upper()}
 
-💰 LIVE Rate: {format_money(market_data['gold_usd_oz'])} USD/oz ⚡
-💱 AED: {format_money_aed(market_data['gold_usd_oz'])}/oz
-⏰ UAE Time: {market_data['last_update']} (Updates every 2min)
-📈 Change: {market_data['change_24h']:+.2f} USD
+💰 LIVE Rate: {rate_usd} USD/oz ⚡
+💱 AED: {rate_aed}/oz
+⏰ UAE Time: {format_last_update(market)} (Updates every 2min)
+📈 Change: {market['change_24h']:+.2f} USD
 
 🎯 APPROVAL WORKFLOW STATUS:
-• Pending Trades: {len(get_pending_trades())}
-• Approved Trades: {len(approved_trades)}{unfixed_display}
+• Pending Trades: {pending_count}
+• Approved Trades: {approved_trades.approved_count}{unfixed_display}
 • Notifications: 📲 ACTIVE
 
 🔧 v4.9.3 FIXES APPLIED:
@@ -1670,349 +2259,323 @@ def handle_dashboard(call):
 • All features working perfectly ✅
 
 👆 SELECT ACTION:"""
-        
-        bot.edit_message_text(dashboard_text, call.message.chat.id, call.message.message_id, reply_markup=markup)
-    except Exception as e:
-        logger.error(f"Dashboard error: {e}")
+    
+    edit_message_text(dashboard_text, call.message.chat.id, call.message.message_id, reply_markup=markup)
 
 def handle_approval_dashboard(call):
     """FIXED: Approval dashboard with better navigation"""
-    try:
-        user_id = call.from_user.id
-        session_data = user_sessions.get(user_id, {})
-        dealer = session_data.get("dealer")
-        
-        if not dealer:
-            bot.edit_message_text("❌ Please login again", call.message.chat.id, call.message.message_id)
-            return
-        
-        permissions = dealer.get('permissions', [])
-        
-        if not any(p in permissions for p in ['approve', 'reject', 'comment', 'final_approve']):
-            bot.edit_message_text("❌ No approval permissions", call.message.chat.id, call.message.message_id)
-            return
-        
-        pending_list = list(get_pending_trades().values())
-        
-        markup = types.InlineKeyboardMarkup()
-        
-        if pending_list:
-            for trade in pending_list[:10]:  # Show first 10
-                short_id = trade.session_id[-8:]
-                status_emoji = {
-                    "pending": "🔴",
-                    "abhay_approved": "🟡", 
-                    "mushtaq_approved": "🟠"
-                }.get(trade.approval_status, "⚪")
-                
-                volume_display = f"{trade.volume_kg:.1f}KG" if trade.volume_kg < 10 else f"{trade.volume_kg:.0f}KG"
-                
-                markup.add(types.InlineKeyboardButton(
-                    f"{status_emoji} {trade.customer} - {trade.operation.upper()} {volume_display} - {short_id}",
-                    callback_data=f"view_trade_{trade.session_id}"
-                ))
-        else:
-            markup.add(types.InlineKeyboardButton("✅ No pending trades", callback_data="dashboard"))
-        
-        # FIXED: Better navigation back to dashboard
-        markup.add(types.InlineKeyboardButton("🔙 Dashboard", callback_data="dashboard"))
-        
-        role_info = dealer.get('role', dealer['level'].title())
-        workflow_stage = "ANY STAGE" if 'final_approve' in permissions else "FIRST STAGE" if dealer['name'] == "Abhay" else "SECOND STAGE" if dealer['name'] == "Mushtaq" else "UNKNOWN"
-        
-        bot.edit_message_text(
-            f"""✅ APPROVAL DASHBOARD v4.9.3
+    user_id = call.from_user.id
+    session_data = user_sessions.get(user_id, {})
+    dealer = session_data.get("dealer")
+    
+    if not dealer:
+        edit_message_text("❌ Please login again", call.message.chat.id, call.message.message_id)
+        return
+    
+    permissions = dealer.get('permissions', [])
+    
+    if not dealer_access(frozenset(permissions)).can_approve:
+        edit_message_text("❌ No approval permissions", call.message.chat.id, call.message.message_id)
+        return
+    
+    pending_list = list(get_pending_trades().values())
+    status_counts = Counter(t.approval_status for t in pending_list)
+    
+    buttons = []
+    
+    if pending_list:
+        for trade in pending_list[:10]:  # Show first 10
+            short_id = trade.session_id[-8:]
+            status_emoji = {
+                "pending": "🔴",
+                "abhay_approved": "🟡", 
+                "mushtaq_approved": "🟠"
+            }.get(trade.approval_status, "⚪")
+            
+            volume_display = f"{trade.volume_kg:.1f}KG" if trade.volume_kg < 10 else f"{trade.volume_kg:.0f}KG"
+            
+            buttons.append((
+                f"{status_emoji} {trade.customer} - {trade.operation.upper()} {volume_display} - {short_id}",
+                f"view_trade_{trade.session_id}"
+            ))
+    else:
+        buttons.append(("✅ No pending trades", "dashboard"))
+    
+    # FIXED: Better navigation back to dashboard
+    buttons.append(("🔙 Dashboard", "dashboard"))
+    markup = build_markup(*buttons)
+    
+    role_info = dealer.get('role', dealer['level'].title())
+    workflow_stage = "ANY STAGE" if 'final_approve' in permissions else "FIRST STAGE" if dealer['name'] == "Abhay" else "SECOND STAGE" if dealer['name'] == "Mushtaq" else "UNKNOWN"
+    
+    edit_message_text(
+        f"""✅ APPROVAL DASHBOARD v4.9.3
 
 👤 {dealer['name']} ({role_info})
 🔒 Permissions: {', '.join(permissions).upper()}
 🎯 Workflow Stage: {workflow_stage}
 
 📊 TRADE STATUS:
-• 🔴 Pending Approval: {len([t for t in pending_list if t.approval_status == "pending"])}
-• 🟡 Abhay Approved: {len([t for t in pending_list if t.approval_status == "abhay_approved"])}
-• 🟠 Mushtaq Approved: {len([t for t in pending_list if t.approval_status == "mushtaq_approved"])}
-• 📈 Total Approved: {len(approved_trades)}
+• 🔴 Pending Approval: {status_counts["pending"]}
+• 🟡 Abhay Approved: {status_counts["abhay_approved"]}
+• 🟠 Mushtaq Approved: {status_counts["mushtaq_approved"]}
+• 📈 Total Approved: {approved_trades.approved_count}
 
 🔧 v4.9.3 NAVIGATION FIXED!
 
 🎯 SELECT TRADE TO REVIEW:
 
 👆 SELECT ACTION:""",
-            call.message.chat.id,
-            call.message.message_id,
-            reply_markup=markup
-        )
-    except Exception as e:
-        logger.error(f"Approval dashboard error: {e}")
+        call.message.chat.id,
+        call.message.message_id,
+        reply_markup=markup
+    )
 
-def handle_view_trade(call):
+def handle_view_trade(call, trade_id):
     """FIXED: View trade with better navigation"""
-    try:
-        trade_id = call.data.replace("view_trade_", "")
-        user_id = call.from_user.id
-        session_data = user_sessions.get(user_id, {})
-        dealer = session_data.get("dealer")
-        
-        if not dealer:
-            bot.edit_message_text("❌ Please login again", call.message.chat.id, call.message.message_id)
-            return
-        
-        if trade_id not in pending_trades:
-            # FIXED: Better handling when trade not found
-            markup = types.InlineKeyboardMarkup()
-            markup.add(types.InlineKeyboardButton("🔙 Approval Dashboard", callback_data="approval_dashboard"))
-            bot.edit_message_text("❌ Trade not found or already processed", call.message.chat.id, call.message.message_id, reply_markup=markup)
-            return
-        
-        trade = pending_trades[trade_id]
-        permissions = dealer.get('permissions', [])
-        
-        # Calculate trade totals for display
-        calc_results = calculate_trade_totals_with_override(
-            trade.volume_kg,
-            trade.gold_purity['value'],
-            getattr(trade, 'final_rate_per_oz', market_data['gold_usd_oz']),
-            getattr(trade, 'rate_type', 'market')
-        )
-        
-        markup = types.InlineKeyboardMarkup()
-        
-        # Add approval/rejection buttons based on permissions and workflow
-        if 'approve' in permissions or 'final_approve' in permissions:
-            if (dealer['name'] == "Abhay" and trade.approval_status == "pending") or \
-               (dealer['name'] == "Mushtaq" and trade.approval_status == "abhay_approved") or \
-               (dealer['name'] == "Ahmadreza" and trade.approval_status == "mushtaq_approved"):
-                markup.add(types.InlineKeyboardButton("✅ APPROVE", callback_data=f"approve_{trade_id}"))
-        
-        if 'reject' in permissions or 'final_approve' in permissions:
-            if trade.approval_status in ["pending", "abhay_approved", "mushtaq_approved"]:
-                markup.add(types.InlineKeyboardButton("❌ REJECT", callback_data=f"reject_{trade_id}"))
-        
-        if 'comment' in permissions:
-            markup.add(types.InlineKeyboardButton("💬 Add Comment", callback_data=f"comment_{trade_id}"))
-        
-        if 'delete_row' in permissions:
-            markup.add(types.InlineKeyboardButton("🗑️ Delete Trade", callback_data=f"delete_trade_{trade_id}"))
-        
-        # FIXED: Better navigation buttons
-        markup.add(types.InlineKeyboardButton("🔙 Approval Dashboard", callback_data="approval_dashboard"))
-        markup.add(types.InlineKeyboardButton("🏠 Dashboard", callback_data="dashboard"))
-        
-        # Build display
-        gold_desc = trade.gold_type['name']
-        if hasattr(trade, 'quantity') and trade.quantity:
-            gold_desc += f" (qty: {trade.quantity})"
-        
-        approved_by_text = " → ".join(trade.approved_by) if trade.approved_by else "None yet"
-        comments_text = "\n".join([f"• {comment}" for comment in trade.comments]) if trade.comments else "No comments"
-        
-        trade_text = f"""📊 TRADE REVIEW - {trade.session_id[-8:]}
+    user_id = call.from_user.id
+    session_data = user_sessions.get(user_id, {})
+    dealer = session_data.get("dealer")
+    
+    if not dealer:
+        edit_message_text("❌ Please login again", call.message.chat.id, call.message.message_id)
+        return
+    
+    trade = pending_trades.get(trade_id)
+    if trade is None:
+        # FIXED: Better handling when trade not found
+        edit_message_text("❌ Trade not found or already processed", call.message.chat.id, call.message.message_id, reply_markup=BACK_TO_APPROVAL_MARKUP)
+        return
+    
+    permissions = dealer.get('permissions', [])
+    
+    # Calculate trade totals for display (cached on the trade between renders)
+    final_rate = trade.final_rate_per_oz
+    rate_type = trade.rate_type
+    calc_results = trade.trade_totals(final_rate, rate_type)
+    approval_status = trade.approval_status
+    dealer_name = dealer['name']
+    
+    buttons = []
+    
+    # Add approval/rejection buttons based on permissions and workflow
+    if 'approve' in permissions or 'final_approve' in permissions:
+        if (dealer_name == "Abhay" and approval_status == "pending") or \
+           (dealer_name == "Mushtaq" and approval_status == "abhay_approved") or \
+           (dealer_name == "Ahmadreza" and approval_status == "mushtaq_approved"):
+            buttons.append(("✅ APPROVE", f"approve_{trade_id}"))
+    
+    if 'reject' in permissions or 'final_approve' in permissions:
+        if approval_status in ("pending", "abhay_approved", "mushtaq_approved"):
+            buttons.append(("❌ REJECT", f"reject_{trade_id}"))
+    
+    if 'comment' in permissions:
+        buttons.append(("💬 Add Comment", f"comment_{trade_id}"))
+    
+    if 'delete_row' in permissions:
+        buttons.append(("🗑️ Delete Trade", f"delete_trade_{trade_id}"))
+    
+    # FIXED: Better navigation buttons
+    buttons.append(("🔙 Approval Dashboard", "approval_dashboard"))
+    buttons.append(("🏠 Dashboard", "dashboard"))
+    markup = build_markup(*buttons)
+    
+    # Build display
+    gold_desc = trade.gold_type['name']
+    if trade.quantity:
+        gold_desc += f" (qty: {trade.quantity})"
+    
+    approved_by_text = " → ".join(trade.approved_by) if trade.approved_by else "None yet"
+    total_usd = calc_results.total_price_usd
+    now_str = uae_timestamp()
+    comments_text = join_capped((f"• {comment}" for comment in trade.comments), COMMENTS_TEXT_BUDGET) if trade.comments else "No comments"
+    
+    trade_text = f"""📊 TRADE REVIEW - {trade.session_id[-8:]}
 
 👤 TRADE DETAILS:
 • Dealer: {trade.dealer['name']}
 • Operation: {trade.operation.upper()}
 • Customer: {trade.customer}
-• Communication: {getattr(trade, 'communication_type', 'Regular')}
+• Communication: {trade.communication_type}
 
 📏 GOLD SPECIFICATION:
 • Type: {gold_desc}
 • Volume: {format_weight_combined(trade.volume_kg)}
 • Purity: {trade.gold_purity['name']}
-• Pure Gold: {format_weight_combined(calc_results['pure_gold_kg'])}
+• Pure Gold: {format_weight_combined(calc_results.pure_gold_kg)}
 
 💰 FINANCIAL DETAILS:
-• Rate Type: {getattr(trade, 'rate_type', 'market').title()}
-• Final Rate: ${getattr(trade, 'final_rate_per_oz', market_data['gold_usd_oz']):,.2f}/oz
-• USD Amount: {format_money(calc_results['total_price_usd'])}
-• AED Amount: {format_money_aed(calc_results['total_price_usd'])}
+• Rate Type: {rate_type.title()}
+• Final Rate: ${final_rate:,.2f}/oz
+• USD Amount: {format_money(total_usd)}
+• AED Amount: {format_money_aed(total_usd)}
 
 🎯 APPROVAL STATUS:
-• Current Status: {trade.approval_status.upper()}
+• Current Status: {approval_status.upper()}
 • Approved By: {approved_by_text}
 • Created: {trade.created_at.strftime('%Y-%m-%d %H:%M:%S')} UAE
 
 💬 COMMENTS:
 {comments_text}
 
-⏰ Current Time: {get_uae_time().strftime('%Y-%m-%d %H:%M:%S')} UAE
+⏰ Current Time: {now_str} UAE
 
 👆 SELECT ACTION:"""
-        
-        bot.edit_message_text(
-            trade_text,
-            call.message.chat.id,
-            call.message.message_id,
-            reply_markup=markup
-        )
-    except Exception as e:
-        logger.error(f"View trade error: {e}")
-
-def handle_approve_trade(call):
+    
+    edit_message_text(
+        trade_text,
+        call.message.chat.id,
+        call.message.message_id,
+        reply_markup=markup
+    )
+
+def handle_approve_trade(call, trade_id):
     """FIXED: Approve trade with better feedback and navigation"""
-    try:
-        trade_id = call.data.replace("approve_", "")
-        user_id = call.from_user.id
-        session_data = user_sessions.get(user_id, {})
-        dealer = session_data.get("dealer")
-        
-        if not dealer:
-            bot.edit_message_text("❌ Please login again", call.message.chat.id, call.message.message_id)
-            return
-        
-        success, result = approve_trade(trade_id, dealer['name'])
-        
-        # FIXED: Better navigation for approvers
-        markup = types.InlineKeyboardMarkup()
-        markup.add(types.InlineKeyboardButton("✅ Approval Dashboard", callback_data="approval_dashboard"))
-        markup.add(types.InlineKeyboardButton("🏠 Dashboard", callback_data="dashboard"))
-        
-        if success:
-            bot.edit_message_text(
-                f"""✅ TRADE APPROVED!
+    user_id = call.from_user.id
+    session_data = user_sessions.get(user_id, {})
+    dealer = session_data.get("dealer")
+    
+    if not dealer:
+        edit_message_text("❌ Please login again", call.message.chat.id, call.message.message_id)
+        return
+    
+    success, result = approve_trade(trade_id, dealer['name'])
+    
+    # FIXED: Better navigation for approvers
+    markup = APPROVAL_RESULT_MARKUP
+    
+    if success:
+        edit_message_text(
+            f"""✅ TRADE APPROVED!
 
 📊 Trade ID: {trade_id[-8:]}
 👤 Approved by: {dealer['name']}
 📋 Result: {result}
 
-✅ Workflow updated and notifications sent.
+✅ Workflow updated and notifications queued.
 
 🔧 v4.9.3 Navigation Fixed!
 
 👆 SELECT ACTION:""",
-                call.message.chat.id,
-                call.message.message_id,
-                reply_markup=markup
-            )
-        else:
-            bot.edit_message_text(
-                f"""❌ APPROVAL FAILED
+            call.message.chat.id,
+            call.message.message_id,
+            reply_markup=markup
+        )
+    else:
+        edit_message_text(
+            f"""❌ APPROVAL FAILED
 
 Error: {result}
 
 👆 SELECT ACTION:""",
-                call.message.chat.id,
-                call.message.message_id,
-                reply_markup=markup
-            )
-    except Exception as e:
-        logger.error(f"Approve trade error: {e}")
+            call.message.chat.id,
+            call.message.message_id,
+            reply_markup=markup
+        )
 
-def handle_reject_trade(call):
+def handle_reject_trade(call, trade_id):
     """FIXED: Reject trade with better navigation"""
-    try:
-        trade_id = call.data.replace("reject_", "")
-        user_id = call.from_user.id
-        session_data = user_sessions.get(user_id, {})
-        dealer = session_data.get("dealer")
-        
-        if not dealer:
-            bot.edit_message_text("❌ Please login again", call.message.chat.id, call.message.message_id)
-            return
-        
-        success, result = reject_trade(trade_id, dealer['name'], "Rejected via approval dashboard")
-        
-        # FIXED: Better navigation for approvers
-        markup = types.InlineKeyboardMarkup()
-        markup.add(types.InlineKeyboardButton("✅ Approval Dashboard", callback_data="approval_dashboard"))
-        markup.add(types.InlineKeyboardButton("🏠 Dashboard", callback_data="dashboard"))
-        
-        if success:
-            bot.edit_message_text(
-                f"""❌ TRADE REJECTED!
+    user_id = call.from_user.id
+    session_data = user_sessions.get(user_id, {})
+    dealer = session_data.get("dealer")
+    
+    if not dealer:
+        edit_message_text("❌ Please login again", call.message.chat.id, call.message.message_id)
+        return
+    
+    success, result = reject_trade(trade_id, dealer['name'], "Rejected via approval dashboard")
+    
+    # FIXED: Better navigation for approvers
+    markup = APPROVAL_RESULT_MARKUP
+    
+    if success:
+        edit_message_text(
+            f"""❌ TRADE REJECTED!
 
 📊 Trade ID: {trade_id[-8:]}
 👤 Rejected by: {dealer['name']}
 📋 Result: {result}
 
-❌ Trade removed from approval workflow and updated in sheets.
+❌ Trade removed from approval workflow. Sheet status update queued.
 
 👆 SELECT ACTION:""",
-                call.message.chat.id,
-                call.message.message_id,
-                reply_markup=markup
-            )
-        else:
-            bot.edit_message_text(
-                f"""❌ REJECTION FAILED
+            call.message.chat.id,
+            call.message.message_id,
+            reply_markup=markup
+        )
+    else:
+        edit_message_text(
+            f"""❌ REJECTION FAILED
 
 Error: {result}
 
 👆 SELECT ACTION:""",
-                call.message.chat.id,
-                call.message.message_id,
-                reply_markup=markup
-            )
-    except Exception as e:
-        logger.error(f"Reject trade error: {e}")
+            call.message.chat.id,
+            call.message.message_id,
+            reply_markup=markup
+        )
 
-def handle_comment_trade(call):
+def handle_comment_trade(call, trade_id):
     """Add comment to trade"""
-    try:
-        trade_id = call.data.replace("comment_", "")
-        user_id = call.from_user.id
-        session_data = user_sessions.get(user_id, {})
-        dealer = session_data.get("dealer")
-        
-        if not dealer:
-            bot.edit_message_text("❌ Please login again", call.message.chat.id, call.message.message_id)
-            return
-        
-        success, result = add_comment_to_trade(trade_id, dealer['name'], "Reviewed via approval dashboard")
-        
-        markup = types.InlineKeyboardMarkup()
-        markup.add(types.InlineKeyboardButton("🔙 View Trade", callback_data=f"view_trade_{trade_id}"))
-        markup.add(types.InlineKeyboardButton("✅ Approval Dashboard", callback_data="approval_dashboard"))
-        
-        if success:
-            bot.edit_message_text(
-                f"""💬 COMMENT ADDED!
+    user_id = call.from_user.id
+    session_data = user_sessions.get(user_id, {})
+    dealer = session_data.get("dealer")
+    
+    if not dealer:
+        edit_message_text("❌ Please login again", call.message.chat.id, call.message.message_id)
+        return
+    
+    success, result = add_comment_to_trade(trade_id, dealer['name'], "Reviewed via approval dashboard")
+    
+    markup = build_markup(
+        ("🔙 View Trade", f"view_trade_{trade_id}"),
+        ("✅ Approval Dashboard", "approval_dashboard")
+    )
+    
+    if success:
+        edit_message_text(
+            f"""💬 COMMENT ADDED!
 
 📊 Trade ID: {trade_id[-8:]}
 👤 Comment by: {dealer['name']}
 📋 Result: {result}
 
-✅ Comment added and sheets updated.
+✅ Comment added. Sheet status update queued.
 
 👆 SELECT ACTION:""",
-                call.message.chat.id,
-                call.message.message_id,
-                reply_markup=markup
-            )
-        else:
-            bot.edit_message_text(
-                f"""❌ COMMENT FAILED
+            call.message.chat.id,
+            call.message.message_id,
+            reply_markup=markup
+        )
+    else:
+        edit_message_text(
+            f"""❌ COMMENT FAILED
 
 Error: {result}
 
 👆 SELECT ACTION:""",
-                call.message.chat.id,
-                call.message.message_id,
-                reply_markup=markup
-            )
-    except Exception as e:
-        logger.error(f"Comment trade error: {e}")
+            call.message.chat.id,
+            call.message.message_id,
+            reply_markup=markup
+        )
 
-def handle_delete_trade(call):
+def handle_delete_trade(call, trade_id):
     """Delete trade from approval workflow"""
-    try:
-        trade_id = call.data.replace("delete_trade_", "")
-        user_id = call.from_user.id
-        session_data = user_sessions.get(user_id, {})
-        dealer = session_data.get("dealer")
-        
-        if not dealer or 'delete_row' not in dealer.get('permissions', []):
-            bot.edit_message_text("❌ No delete permissions", call.message.chat.id, call.message.message_id)
-            return
-        
-        success, result = delete_trade_from_approval(trade_id, dealer['name'])
-        
-        markup = types.InlineKeyboardMarkup()
-        markup.add(types.InlineKeyboardButton("✅ Approval Dashboard", callback_data="approval_dashboard"))
-        markup.add(types.InlineKeyboardButton("🔙 Dashboard", callback_data="dashboard"))
-        
-        if success:
-            bot.edit_message_text(
-                f"""🗑️ TRADE DELETED!
+    user_id = call.from_user.id
+    session_data = user_sessions.get(user_id, {})
+    dealer = session_data.get("dealer")
+    
+    if not dealer or 'delete_row' not in dealer.get('permissions', []):
+        edit_message_text("❌ No delete permissions", call.message.chat.id, call.message.message_id)
+        return
+    
+    success, result = delete_trade_from_approval(trade_id, dealer['name'])
+    
+    markup = DELETE_RESULT_MARKUP
+    
+    if success:
+        edit_message_text(
+            f"""🗑️ TRADE DELETED!
 
 📊 Trade ID: {trade_id[-8:]}
 👤 Deleted by: {dealer['name']}
@@ -2021,66 +2584,65 @@ def handle_delete_trade(call):
 🗑️ Trade completely removed from approval workflow.
 
 👆 SELECT ACTION:""",
-                call.message.chat.id,
-                call.message.message_id,
-                reply_markup=markup
-            )
-        else:
-            bot.edit_message_text(
-                f"""❌ DELETE FAILED
+            call.message.chat.id,
+            call.message.message_id,
+            reply_markup=markup
+        )
+    else:
+        edit_message_text(
+            f"""❌ DELETE FAILED
 
 Error: {result}
 
 👆 SELECT ACTION:""",
-                call.message.chat.id,
-                call.message.message_id,
-                reply_markup=markup
-            )
-    except Exception as e:
-        logger.error(f"Delete trade error: {e}")
+            call.message.chat.id,
+            call.message.message_id,
+            reply_markup=markup
+        )
 
-def handle_fix_unfixed_deals(call):
-    """FIXED: Enhanced unfixed deals fixing with better feedback"""
-    try:
-        user_id = call.from_user.id
-        session_data = user_sessions.get(user_id, {})
-        dealer = session_data.get("dealer")
-        
-        if not dealer:
-            bot.edit_message_text("❌ Please login again", call.message.chat.id, call.message.message_id)
-            return
-        
-        permissions = dealer.get('permissions', [])
-        if not any(p in permissions for p in ['buy', 'sell', 'admin']):
-            bot.edit_message_text("❌ No permissions to fix rates", call.message.chat.id, call.message.message_id)
-            return
-        
-        bot.edit_message_text("🔍 Searching for unfixed trades...", call.message.chat.id, call.message.message_id)
-        
-        unfixed_list = get_unfixed_trades_from_sheets()
-        
-        markup = types.InlineKeyboardMarkup()
-        
-        if unfixed_list:
-            for trade in unfixed_list[:10]:  # Show first 10
-                display_text = f"📍 {trade['customer']} | {trade['operation']} | {trade['volume']} | {trade['date']} {trade['time']}"
-                if len(display_text) > 60:
-                    display_text = display_text[:57] + "..."
-                markup.add(types.InlineKeyboardButton(
-                    display_text,
-                    callback_data=f"fix_rate_{trade['sheet_name']}_{trade['row_number']}"
-                ))
-        else:
-            markup.add(types.InlineKeyboardButton("✅ No unfixed trades found", callback_data="dashboard"))
-        
-        markup.add(types.InlineKeyboardButton("🔄 Refresh List", callback_data="fix_unfixed_deals"))
-        markup.add(types.InlineKeyboardButton("🔙 Dashboard", callback_data="dashboard"))
-        
-        bot.edit_message_text(
-            f"""🔧 FIX UNFIXED DEALS v4.9.3
+def handle_fix_unfixed_deals(call, refresh=False):
+    """FIXED: Enhanced unfixed deals fixing with better feedback (refresh bypasses the unfixed cache)"""
+    user_id = call.from_user.id
+    session_data = user_sessions.get(user_id, {})
+    dealer = session_data.get("dealer")
+    
+    if not dealer:
+        edit_message_text("❌ Please login again", call.message.chat.id, call.message.message_id)
+        return
+    
+    if not dealer_access(frozenset(dealer.get('permissions', []))).can_fix_rates:
+        edit_message_text("❌ No permissions to fix rates", call.message.chat.id, call.message.message_id)
+        return
+    
+    if refresh:
+        invalidate_unfixed_cache()
+    unfixed_list = run_with_progress(
+        "🔍 Searching for unfixed trades...", call.message.chat.id, call.message.message_id,
+        get_unfixed_trades_from_sheets
+    )
+    
+    buttons = []
+    
+    if unfixed_list:
+        for trade in unfixed_list[:10]:  # Show first 10
+            display_text = f"📍 {trade['customer']} | {trade['operation']} | {trade['volume']} | {trade['date']} {trade['time']}"
+            if len(display_text) > 60:
+                display_text = display_text[:57] + "..."
+            buttons.append((display_text, f"fix_rate_{trade['sheet_name']}_{trade['row_number']}"))
+    else:
+        buttons.append(("✅ No unfixed trades found", "dashboard"))
+    
+    buttons.append(("🔄 Refresh List", "refresh_unfixed_deals"))
+    buttons.append(("🔙 Dashboard", "dashboard"))
+    markup = build_markup(*buttons)
+    # Refresh time keeps a re-read with an unchanged list from being skipped as a duplicate edit
+    refreshed_display = f"\n🔄 Refreshed: {uae_timestamp()[11:]} UAE" if refresh else ""
+    
+    edit_message_text(
+        f"""🔧 FIX UNFIXED DEALS v4.9.3
 
 👤 Dealer: {dealer['name']} (ALL dealers can fix rates)
-🔍 Found: {len(unfixed_list)} unfixed trades
+🔍 Found: {len(unfixed_list)} unfixed trades{refreshed_display}
 
 💡 These trades were saved with unfixed rates and need rate fixing.
 🔧 You can fix rates using Market or Custom base rates with P/D.
@@ -2089,56 +2651,51 @@ def handle_fix_unfixed_deals(call):
 🎯 SELECT TRADE TO FIX:
 
 👆 SELECT ACTION:""",
-            call.message.chat.id,
-            call.message.message_id,
-            reply_markup=markup
-        )
-    except Exception as e:
-        logger.error(f"Fix unfixed deals error: {e}")
+        call.message.chat.id,
+        call.message.message_id,
+        reply_markup=markup
+    )
 
-def handle_fix_rate(call):
+def handle_fix_rate(call, target):
     """Handle fixing specific rate"""
-    try:
-        user_id = call.from_user.id
-        session_data = user_sessions.get(user_id, {})
-        dealer = session_data.get("dealer")
-        
-        if not dealer:
-            bot.edit_message_text("❌ Please login again", call.message.chat.id, call.message.message_id)
-            return
-        
-        # Parse callback data
-        parts = call.data.replace("fix_rate_", "").split("_")
-        if len(parts) < 3:
-            bot.edit_message_text("❌ Invalid fix request", call.message.chat.id, call.message.message_id)
-            return
-        
-        # Reconstruct sheet name and row number
-        row_number = int(parts[-1])
-        sheet_name = "_".join(parts[:-1])
-        
-        # Store fixing session data
-        session_data["fixing_mode"] = True
-        session_data["fixing_sheet"] = sheet_name
-        session_data["fixing_row"] = row_number
-        
-        # Auto-refresh rate for fixing
-        fetch_gold_rate()
-        
-        markup = types.InlineKeyboardMarkup()
-        markup.add(types.InlineKeyboardButton("📊 Market Rate", callback_data="fixrate_market"))
-        markup.add(types.InlineKeyboardButton("⚡ Custom Rate", callback_data="fixrate_custom"))
-        markup.add(types.InlineKeyboardButton("🔙 Back", callback_data="fix_unfixed_deals"))
-        
-        bot.edit_message_text(
-            f"""🔧 FIX RATE - RATE TYPE
+    user_id = call.from_user.id
+    session_data = user_sessions.get(user_id, {})
+    dealer = session_data.get("dealer")
+    
+    if not dealer:
+        edit_message_text("❌ Please login again", call.message.chat.id, call.message.message_id)
+        return
+    
+    # Parse callback data
+    parts = target.split("_")
+    if len(parts) < 3:
+        edit_message_text("❌ Invalid fix request", call.message.chat.id, call.message.message_id)
+        return
+    
+    # Reconstruct sheet name and row number
+    row_number = int(parts[-1])
+    sheet_name = "_".join(parts[:-1])
+    
+    # Store fixing session data
+    session_data["fixing_mode"] = True
+    session_data["fixing_sheet"] = sheet_name
+    session_data["fixing_row"] = row_number
+    
+    # Fixing needs a near-live rate - refresh unless the updater fetched one moments ago
+    refresh_gold_rate(FIX_RATE_MAX_AGE)
+    
+    market = market_data
+    markup = FIX_RATE_TYPE_MARKUP
+    
+    edit_message_text(
+        f"""🔧 FIX RATE - RATE TYPE
 
 📊 Sheet: {sheet_name}
 📍 Row: {row_number}
 👤 Fixing by: {dealer['name']}
 
-💰 Current Market: {format_money(market_data['gold_usd_oz'])} USD/oz
-⏰ Updated: {market_data['last_update']} UAE
+💰 Current Market: {market_rate_text(market['gold_usd_oz'])[0]} USD/oz
+⏰ Updated: {format_last_update(market)} UAE
 
 🎯 SELECT RATE TYPE:
 
@@ -2146,139 +2703,118 @@ def handle_fix_rate(call):
 • Custom Rate: Specify custom base rate
 
 👆 SELECT TYPE:""",
-            call.message.chat.id,
-            call.message.message_id,
-            reply_markup=markup
-        )
-    except Exception as e:
-        logger.error(f"Fix rate error: {e}")
+        call.message.chat.id,
+        call.message.message_id,
+        reply_markup=markup
+    )
 
-def handle_fixrate_choice(call):
+def handle_fixrate_choice(call, choice):
     """Handle fix rate choice"""
-    try:
-        user_id = call.from_user.id
-        choice = call.data.replace("fixrate_", "")
-        
-        session_data = user_sessions.get(user_id, {})
-        
-        if not session_data.get("fixing_mode"):
-            bot.edit_message_text("❌ No fixing session", call.message.chat.id, call.message.message_id)
-            return
-        
-        session_data["fixing_rate_type"] = choice
+    user_id = call.from_user.id
+    
+    session_data = user_sessions.get(user_id, {})
+    
+    if not session_data.get("fixing_mode"):
+        edit_message_text("❌ No fixing session", call.message.chat.id, call.message.message_id)
+        return
+    
+    session_data["fixing_rate_type"] = choice
+    
+    if choice == "market":
+        market = market_data  # one consistent snapshot for stored rate and display
+        session_data["fixing_rate"] = market['gold_usd_oz']
+        
+        markup = build_markup(
+            ("⬆️ PREMIUM", "fixpd_premium"),
+            ("⬇️ DISCOUNT", "fixpd_discount"),
+            ("🔙 Back", f"fix_rate_{session_data['fixing_sheet']}_{session_data['fixing_row']}")
+        )
         
-        if choice == "market":
-            session_data["fixing_rate"] = market_data['gold_usd_oz']
-            
-            markup = types.InlineKeyboardMarkup()
-            markup.add(types.InlineKeyboardButton("⬆️ PREMIUM", callback_data="fixpd_premium"))
-            markup.add(types.InlineKeyboardButton("⬇️ DISCOUNT", callback_data="fixpd_discount"))
-            markup.add(types.InlineKeyboardButton("🔙 Back", callback_data=f"fix_rate_{session_data['fixing_sheet']}_{session_data['fixing_row']}"))
-            
-            bot.edit_message_text(
-                f"""🔧 FIX RATE - PREMIUM/DISCOUNT
+        edit_message_text(
+            f"""🔧 FIX RATE - PREMIUM/DISCOUNT
 
 ✅ Rate Type: Market Rate
-✅ Base Rate: ${market_data['gold_usd_oz']:,.2f}/oz
-⏰ UAE Time: {market_data['last_update']}
+✅ Base Rate: ${market['gold_usd_oz']:,.2f}/oz
+⏰ UAE Time: {format_last_update(market)}
 
 🎯 SELECT PREMIUM OR DISCOUNT:
 
 👆 SELECT TYPE:""",
-                call.message.chat.id,
-                call.message.message_id,
-                reply_markup=markup
-            )
-        elif choice == "custom":
-            markup = types.InlineKeyboardMarkup()
-            
-            # Add current market rate as first option
-            markup.add(types.InlineKeyboardButton(f"📊 Market Rate (${market_data['gold_usd_oz']:,.2f})", 
-                                                 callback_data=f"fixcustom_{market_data['gold_usd_oz']:.2f}"))
-            
-            # Add preset custom rates
-            for rate in CUSTOM_RATE_PRESETS:
-                markup.add(types.InlineKeyboardButton(f"${rate:,.2f}", callback_data=f"fixcustom_{rate}"))
-            
-            markup.add(types.InlineKeyboardButton("🔙 Back", callback_data=f"fix_rate_{session_data['fixing_sheet']}_{session_data['fixing_row']}"))
-            
-            bot.edit_message_text(
-                f"""🔧 FIX RATE - CUSTOM RATE SELECTION
+            call.message.chat.id,
+            call.message.message_id,
+            reply_markup=markup
+        )
+    elif choice == "custom":
+        # Current market rate first, then the preset custom rates
+        market_rate = market_data['gold_usd_oz']
+        markup = build_markup(
+            (f"📊 Market Rate (${market_rate:,.2f})", f"fixcustom_{market_rate:.2f}"),
+            *CUSTOM_RATE_BUTTONS,
+            ("🔙 Back", f"fix_rate_{session_data['fixing_sheet']}_{session_data['fixing_row']}")
+        )
+        
+        edit_message_text(
+            f"""🔧 FIX RATE - CUSTOM RATE SELECTION
 
 ✅ Rate Type: Custom Rate
-💰 Current Market: {format_money(market_data['gold_usd_oz'])} USD/oz
+💰 Current Market: {market_rate_text(market_data['gold_usd_oz'])[0]} USD/oz
 
 🎯 SELECT CUSTOM BASE RATE:
 
 👆 SELECT RATE:""",
-                call.message.chat.id,
-                call.message.message_id,
-                reply_markup=markup
-            )
-    except Exception as e:
-        logger.error(f"Fixrate choice error: {e}")
+            call.message.chat.id,
+            call.message.message_id,
+            reply_markup=markup
+        )
 
-def handle_fixcustom_choice(call):
+def handle_fixcustom_choice(call, rate_str):
     """Handle fix custom rate selection"""
-    try:
-        user_id = call.from_user.id
-        rate_str = call.data.replace("fixcustom_", "")
-        custom_rate = float(rate_str)
-        
-        session_data = user_sessions.get(user_id, {})
-        
-        if not session_data.get("fixing_mode"):
-            bot.edit_message_text("❌ No fixing session", call.message.chat.id, call.message.message_id)
-            return
-        
-        session_data["fixing_rate"] = custom_rate
-        
-        markup = types.InlineKeyboardMarkup()
-        markup.add(types.InlineKeyboardButton("⬆️ PREMIUM", callback_data="fixpd_premium"))
-        markup.add(types.InlineKeyboardButton("⬇️ DISCOUNT", callback_data="fixpd_discount"))
-        markup.add(types.InlineKeyboardButton("🔙 Back", callback_data="fixrate_custom"))
-        
-        bot.edit_message_text(
-            f"""🔧 FIX RATE - PREMIUM/DISCOUNT
+    user_id = call.from_user.id
+    custom_rate = float(rate_str)
+    
+    session_data = user_sessions.get(user_id, {})
+    
+    if not session_data.get("fixing_mode"):
+        edit_message_text("❌ No fixing session", call.message.chat.id, call.message.message_id)
+        return
+    
+    session_data["fixing_rate"] = custom_rate
+    
+    markup = FIX_CUSTOM_PD_MARKUP
+    
+    edit_message_text(
+        f"""🔧 FIX RATE - PREMIUM/DISCOUNT
 
 ✅ Rate Type: Custom Rate
 ✅ Base Rate: ${custom_rate:,.2f}/oz
-💰 Market Reference: {format_money(market_data['gold_usd_oz'])} USD/oz
+💰 Market Reference: {market_rate_text(market_data['gold_usd_oz'])[0]} USD/oz
 
 🎯 SELECT PREMIUM OR DISCOUNT:
 
 👆 SELECT TYPE:""",
-            call.message.chat.id,
-            call.message.message_id,
-            reply_markup=markup
-        )
-    except Exception as e:
-        logger.error(f"Fixcustom choice error: {e}")
+        call.message.chat.id,
+        call.message.message_id,
+        reply_markup=markup
+    )
 
-def handle_fixrate_pd(call):
+def handle_fixrate_pd(call, pd_type):
     """Handle fix rate premium/discount"""
-    try:
-        user_id = call.from_user.id
-        pd_type = call.data.replace("fixpd_", "")
-        
-        session_data = user_sessions.get(user_id, {})
-        
-        if not session_data.get("fixing_mode"):
-            bot.edit_message_text("❌ No fixing session", call.message.chat.id, call.message.message_id)
-            return
-        
-        session_data["fixing_pd_type"] = pd_type
-        
-        markup = types.InlineKeyboardMarkup()
-        amounts = PREMIUM_AMOUNTS if pd_type == "premium" else DISCOUNT_AMOUNTS
-        for amount in amounts:
-            markup.add(types.InlineKeyboardButton(f"${amount}", callback_data=f"fixamount_{amount}"))
-        markup.add(types.InlineKeyboardButton("🔙 Back", callback_data=f"fixrate_{session_data.get('fixing_rate_type', 'market')}"))
-        
-        base_rate = session_data.get("fixing_rate", market_data['gold_usd_oz'])
-        
-        bot.edit_message_text(
-            f"""🔧 FIX RATE - AMOUNT
+    user_id = call.from_user.id
+    
+    session_data = user_sessions.get(user_id, {})
+    
+    if not session_data.get("fixing_mode"):
+        edit_message_text("❌ No fixing session", call.message.chat.id, call.message.message_id)
+        return
+    
+    session_data["fixing_pd_type"] = pd_type
+    
+    markup = fix_pd_amount_markup(pd_type, session_data.get('fixing_rate_type', 'market'))
+    
+    base_rate = session_data.get("fixing_rate", market_data['gold_usd_oz'])
+    
+    edit_message_text(
+        f"""🔧 FIX RATE - AMOUNT
 
 ✅ Rate Type: {session_data.get('fixing_rate_type', 'market').title()}
 ✅ Base Rate: ${base_rate:,.2f}/oz
@@ -2287,23 +2823,21 @@ def handle_fixrate_pd(call):
 🎯 SELECT {pd_type.upper()} AMOUNT:
 
 👆 SELECT AMOUNT:""",
-            call.message.chat.id,
-            call.message.message_id,
-            reply_markup=markup
-        )
-    except Exception as e:
-        logger.error(f"Fixrate pd error: {e}")
+        call.message.chat.id,
+        call.message.message_id,
+        reply_markup=markup
+    )
 
-def handle_fix_pd_amount(call):
+def handle_fix_pd_amount(call, amount_str):
     """FIXED: Handle fix premium/discount amount with ENHANCED FEEDBACK"""
     try:
         user_id = call.from_user.id
-        amount = float(call.data.replace("fixamount_", ""))
+        amount = float(amount_str)
         
         session_data = user_sessions.get(user_id, {})
         
         if not session_data.get("fixing_mode"):
-            bot.edit_message_text("❌ No fixing session", call.message.chat.id, call.message.message_id)
+            edit_message_text("❌ No fixing session", call.message.chat.id, call.message.message_id)
             return
         
         sheet_name = session_data.get("fixing_sheet")
@@ -2314,33 +2848,31 @@ def handle_fix_pd_amount(call):
         dealer = session_data.get("dealer")
         
         if not all([sheet_name, row_number, dealer]):
-            bot.edit_message_text("❌ Fix session error", call.message.chat.id, call.message.message_id)
+            edit_message_text("❌ Fix session error", call.message.chat.id, call.message.message_id)
             return
         
-        # Show processing message
-        bot.edit_message_text("🔧 Fixing rate and updating sheet...", call.message.chat.id, call.message.message_id)
-        
-        # Use enhanced fix_trade_rate function
-        success, result = fix_trade_rate(sheet_name, row_number, rate_type, base_rate, pd_type, amount, dealer['name'])
+        # Use enhanced fix_trade_rate function (processing message only if the sheet update is slow)
+        success, result = run_with_progress(
+            "🔧 Fixing rate and updating sheet...", call.message.chat.id, call.message.message_id,
+            fix_trade_rate, sheet_name, row_number, rate_type, base_rate, pd_type, amount, dealer['name']
+        )
         
         # Clear fixing mode
         for key in ['fixing_mode', 'fixing_sheet', 'fixing_row', 'fixing_pd_type', 'fixing_rate_type', 'fixing_rate']:
             session_data.pop(key, None)
         
-        markup = types.InlineKeyboardMarkup()
-        markup.add(types.InlineKeyboardButton("🔧 Fix More Deals", callback_data="fix_unfixed_deals"))
-        markup.add(types.InlineKeyboardButton("🔙 Dashboard", callback_data="dashboard"))
+        markup = FIX_RESULT_MARKUP
         
         if success:
             # FIXED: Enhanced feedback showing exactly what was changed
-            bot.edit_message_text(
+            edit_message_text(
                 f"""✅ RATE FIXED SUCCESSFULLY! 🎉
 
 📊 SHEET DETAILS:
 • Sheet: {sheet_name}
 • Row: {row_number}
 • Fixed by: {dealer['name']}
-• Time: {get_uae_time().strftime('%Y-%m-%d %H:%M:%S')} UAE
+• Time: {uae_timestamp()} UAE
 
 🔧 DETAILED CHANGES MADE:
 {result}
@@ -2357,7 +2889,7 @@ def handle_fix_pd_amount(call):
                 reply_markup=markup
             )
         else:
-            bot.edit_message_text(
+            edit_message_text(
                 f"""❌ RATE FIX FAILED!
 
 📊 Sheet: {sheet_name}
@@ -2372,14 +2904,12 @@ Please try again or contact admin if the problem persists.
                 reply_markup=markup
             )
     except Exception as e:
-        logger.error(f"Fix pd amount error: {e}")
+        logger.error("Fix pd amount error: %s", e)
         
         # Error handling with proper navigation
-        markup = types.InlineKeyboardMarkup()
-        markup.add(types.InlineKeyboardButton("🔧 Fix More Deals", callback_data="fix_unfixed_deals"))
-        markup.add(types.InlineKeyboardButton("🔙 Dashboard", callback_data="dashboard"))
+        markup = FIX_RESULT_MARKUP
         
-        bot.edit_message_text(
+        edit_message_text(
             f"""❌ CRITICAL ERROR IN RATE FIXING
 
 Error: {str(e)[:200]}
@@ -2392,6 +2922,55 @@ Please contact admin for assistance.
             reply_markup=markup
         )
 
+# ============================================================================
+# CALLBACK DISPATCH TABLES
+# ============================================================================
+
+# Exact callback_data matches (checked first)
+CALLBACK_HANDLERS = {
+    'start': lambda call: start_command(call.message),
+    'dashboard': handle_dashboard,
+    'approval_dashboard': handle_approval_dashboard,
+    'fix_unfixed_deals': handle_fix_unfixed_deals,
+    'refresh_unfixed_deals': lambda call: handle_fix_unfixed_deals(call, refresh=True),
+}
+
+# Prefixed callback families, keyed by the token before the first '_' ->
+# (full prefix, handler); the handler gets the text after the prefix as its argument
+PREFIX_HANDLERS = {
+    'login': ('login_', handle_login),
+    'fix': ('fix_rate_', handle_fix_rate),
+    'fixrate': ('fixrate_', handle_fixrate_choice),
+    'fixcustom': ('fixcustom_', handle_fixcustom_choice),
+    'fixpd': ('fixpd_', handle_fixrate_pd),
+    'fixamount': ('fixamount_', handle_fix_pd_amount),
+    'approve': ('approve_', handle_approve_trade),
+    'reject': ('reject_', handle_reject_trade),
+    'comment': ('comment_', handle_comment_trade),
+    'view': ('view_trade_', handle_view_trade),
+    'delete': ('delete_trade_', handle_delete_trade),
+}
+
+# Callback prefixes that have no handler in this file - separates them
+# from stale/garbage callback data in the fallback
+KNOWN_CALLBACK_PREFIXES = frozenset(PREFIX_HANDLERS) | frozenset({
+    'new', 'show', 'force', 'confirm', 'cancel', 'system', 'test', 'step',
+    'operation', 'goldtype', 'quantity', 'volume', 'purity', 'customer', 'comm',
+    'rate', 'custom', 'pd', 'premium', 'discount'
+})
+
+def dispatch_callback(data):
+    """Resolve callback data to (handler, args), or (None, ()) if unknown"""
+    handler = CALLBACK_HANDLERS.get(data)
+    if handler is not None:
+        return handler, ()
+    entry = PREFIX_HANDLERS.get(data.partition('_')[0])
+    if entry is not None:
+        prefix, handler = entry
+        if data.startswith(prefix):
+            return handler, (data[len(prefix):],)
+    return None, ()
+
 # ============================================================================
 # REMAINING HANDLER FUNCTIONS (Simplified for space)
 # ============================================================================
@@ -2407,6 +2986,24 @@ Please contact admin for assistance.
 # MAIN FUNCTION - v4.9.3
 # ============================================================================
 
+def run_webhook():
+    """Receive updates via Telegram webhook (FastAPI + uvicorn inside telebot)"""
+    webhook_url = f"{WEBHOOK_URL.rstrip('/')}/webhook/"
+    logger.info("🌐 Starting webhook listener on port %s: %s", PORT, webhook_url)
+    bot.remove_webhook()
+    # One process on purpose - sessions and pending trades live in memory.
+    # Telegram keeps up to max_connections requests in flight; the worker pool runs them concurrently.
+    bot.run_webhooks(
+        listen="0.0.0.0",
+        port=PORT,
+        url_path="webhook/",
+        webhook_url=webhook_url,
+        max_connections=BOT_WORKER_THREADS,
+        allowed_updates=["message", "callback_query"],
+        secret_token=WEBHOOK_SECRET,
+        drop_pending_updates=True
+    )
+
 def main():
     """Main function for v4.9.3 with critical fixes"""
     try:
@@ -2421,39 +3018,49 @@ def main():
         logger.info("✅ All v4.9.2 features preserved + fixes")
         logger.info("=" * 60)
         
-        # Initialize
-        market_data["last_update"] = get_uae_time().strftime('%H:%M:%S')
+        # Independent network probes - run them concurrently, report in order
+        logger.info("🔧 Testing connections and fetching initial gold rate...")
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            sheets_future = executor.submit(test_sheets_connection)
+            rate_future = executor.submit(fetch_gold_rate)
+            telegram_future = executor.submit(bot.get_me)
         
-        logger.info("🔧 Testing connections...")
-        sheets_ok, sheets_msg = test_sheets_connection()
-        logger.info(f"📊 Sheets: {sheets_msg}")
+        sheets_ok, sheets_msg = sheets_future.result()
+        logger.info("📊 Sheets: %s", sheets_msg)
         
-        logger.info("💰 Fetching initial gold rate...")
-        rate_ok = fetch_gold_rate()
+        try:
+            logger.info("🤖 Telegram: @%s", telegram_future.result().username)
+        except Exception as e:
+            logger.error("❌ Telegram check failed: %s", e)
+        
+        rate_ok = rate_future.result()
         if rate_ok:
-            logger.info(f"💰 Initial Rate: ${market_data['gold_usd_oz']:.2f} (UAE: {market_data['last_update']})")
+            logger.info("💰 Initial Rate: $%.2f (UAE: %s)", market_data['gold_usd_oz'], format_last_update(market_data))
         else:
-            logger.warning(f"💰 Initial Rate fetch failed, using default: ${market_data['gold_usd_oz']:.2f}")
+            logger.warning("💰 Initial Rate fetch failed, using default: $%.2f", market_data['gold_usd_oz'])
         
         # Start background rate updater
         start_rate_updater()
-        time.sleep(2)
-        
-        logger.info(f"✅ FIXED BOT v4.9.3 READY:")
-        logger.info(f"  💰 Gold: {format_money(market_data['gold_usd_oz'])} | {format_money_aed(market_data['gold_usd_oz'])}")
-        logger.info(f"  🇦🇪 UAE Time: {market_data['last_update']}")
-        logger.info(f"  📊 Sheets: {'Connected' if sheets_ok else 'Fallback mode'}")
-        logger.info(f"  🔧 Critical Fixes: APPLIED")
-        logger.info(f"  ✅ Sheet Format: ALIGNED (21 cols)")
-        logger.info(f"  💬 Dealer Feedback: ENHANCED")
-        logger.info(f"  🔄 Approver Navigation: FIXED")
-        logger.info(f"  ☁️ Platform: Railway (24/7 operation)")
-        
-        logger.info(f"📊 Sheet: https://docs.google.com/spreadsheets/d/{GOOGLE_SHEET_ID}/edit")
+        
+        logger.info("✅ FIXED BOT v4.9.3 READY:")
+        logger.info("  💰 Gold: %s | %s", format_money(market_data['gold_usd_oz']), format_money_aed(market_data['gold_usd_oz']))
+        logger.info("  🇦🇪 UAE Time: %s", format_last_update(market_data))
+        logger.info("  📊 Sheets: %s", 'Connected' if sheets_ok else 'Fallback mode')
+        logger.info("  🔧 Critical Fixes: APPLIED")
+        logger.info("  ✅ Sheet Format: ALIGNED (21 cols)")
+        logger.info("  💬 Dealer Feedback: ENHANCED")
+        logger.info("  🔄 Approver Navigation: FIXED")
+        logger.info("  ☁️ Platform: Railway (24/7 operation)")
+        
+        logger.info("📊 Sheet: https://docs.google.com/spreadsheets/d/%s/edit", GOOGLE_SHEET_ID)
         logger.info("🚀 STARTING FIXED GOLD TRADING SYSTEM v4.9.3...")
         logger.info("=" * 60)
         
-        # Start bot
+        # Start bot - webhook when a public URL is configured, long polling otherwise
+        if WEBHOOK_URL:
+            run_webhook()
+            return
+        
         while True:
             try:
                 logger.info("🚀 Starting FIXED GOLD TRADING bot v4.9.3 polling...")
@@ -2464,14 +3071,14 @@ def main():
                     skip_pending=True
                 )
             except Exception as e:
-                logger.error(f"❌ Bot polling error: {e}")
+                logger.error("❌ Bot polling error: %s", e)
                 logger.info("🔄 Restarting in 10 seconds...")
                 time.sleep(10)
         
     except KeyboardInterrupt:
         logger.info("🛑 Bot stopped by user")
     except Exception as e:
-        logger.error(f"❌ Critical error: {e}")
+        logger.error("❌ Critical error: %s", e)
         logger.info("🔄 Attempting restart in 5 seconds...")
         time.sleep(5)
         main()